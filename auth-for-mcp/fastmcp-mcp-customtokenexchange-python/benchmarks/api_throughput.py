@@ -0,0 +1,230 @@
+"""
+Measure the upstream demo API's throughput per worker process and per core.
+
+The benchmark starts a `LocalIssuer`, then serves `src/api/server.py` from N
+worker processes sharing one port (SO_REUSEPORT, like `uvicorn --workers`), and
+drives `GET /api/private-scope` from several load generator processes for a
+fixed duration. For every worker count it reports requests per second, requests
+per second per worker and requests per CPU-second of the server processes (read
+from `/proc/<pid>/stat` on Linux), with the verified-token cache enabled and
+disabled, so the cost of signature verification per request is visible.
+
+Run the load generators on other cores than the workers for meaningful per-core
+numbers, e.g. with `taskset`, or compare runs with the same layout.
+
+Usage:
+    poetry run python -m benchmarks.api_throughput --workers 1 2 4 --duration 10
+    poetry run python -m benchmarks.api_throughput --workers 2 --cache on --tokens 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from typing import Any
+
+import httpx
+
+from .issuer import LocalIssuer
+
+AUDIENCE = "http://localhost:8787"
+PATH = "/api/private-scope"
+
+
+class RemoteFetch:
+    """Picklable `custom_fetch` that serves `https://{domain}` URLs from the issuer in the parent process."""
+
+    def __init__(self, domain: str, base_url: str):
+        self.domain = domain
+        self.base_url = base_url
+
+    async def __call__(self, url: str) -> httpx.Response:
+        url = url.replace(f"https://{self.domain}", self.base_url, 1)
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url)
+        response.raise_for_status()
+        return response
+
+
+def serve(port: int, fetch: RemoteFetch, cache_size: int, ready: Any) -> None:
+    """Worker process: serve the upstream API on a shared port until terminated."""
+    import uvicorn
+
+    # Point the module-level configuration at the local issuer before it is loaded
+    os.environ["AUTH0_DOMAIN"] = fetch.domain
+    os.environ["API_AUTH0_AUDIENCE"] = AUDIENCE
+    logging.disable(logging.INFO)
+
+    from auth0_api_python import ApiClient, ApiClientOptions
+
+    from src.api.server import create_app
+    from src.auth0.cache import TokenCache
+
+    client = ApiClient(ApiClientOptions(domain=fetch.domain, audience=AUDIENCE, custom_fetch=fetch))
+    app = create_app(client, cache=TokenCache(cache_size) if cache_size > 0 else None)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(("127.0.0.1", port))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False))
+
+    async def main() -> None:
+        task = asyncio.create_task(server.serve(sockets=[sock]))
+        while not server.started:
+            await asyncio.sleep(0.01)
+        ready.set()
+        await task
+
+    asyncio.run(main())
+
+
+def generate_load(url: str, tokens: list[str], concurrency: int, duration: float, results: Any) -> None:
+    """Load generator process: issue requests until the duration elapses and report counts."""
+
+    async def main() -> dict[str, int]:
+        counts = {"ok": 0, "errors": 0}
+        deadline = time.monotonic() + duration
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+            async def worker(offset: int) -> None:
+                i = offset
+                while time.monotonic() < deadline:
+                    token = tokens[i % len(tokens)]
+                    i += concurrency
+                    try:
+                        response = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+                        counts["ok" if response.status_code == 200 else "errors"] += 1
+                    except httpx.HTTPError:
+                        counts["errors"] += 1
+
+            await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return counts
+
+    results.put(asyncio.run(main()))
+
+
+def cpu_seconds(pid: int) -> float | None:
+    """Return user plus system CPU time of a process, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces, fields after it are space separated
+            fields = f.read().rpartition(")")[2].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run(args: argparse.Namespace, issuer: LocalIssuer, workers: int, cache_size: int) -> dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    port = free_port()
+    fetch = RemoteFetch(issuer.domain, issuer.base_url)
+    tokens = [issuer.mint(AUDIENCE, ["read:private"]) for _ in range(args.tokens)]
+
+    servers = []
+    for _ in range(workers):
+        ready = ctx.Event()
+        process = ctx.Process(target=serve, args=(port, fetch, cache_size, ready), daemon=True)
+        process.start()
+        servers.append((process, ready))
+    for process, ready in servers:
+        if not ready.wait(30):
+            raise RuntimeError(f"API worker {process.pid} did not start")
+
+    url = f"http://127.0.0.1:{port}{PATH}"
+    try:
+        # Warm up every worker's key set and cache before measuring
+        with httpx.Client() as client:
+            for token in tokens * 2:
+                client.get(url, headers={"Authorization": f"Bearer {token}"})
+
+        cpu_before = [cpu_seconds(process.pid) for process, _ in servers]
+        results = ctx.Queue()
+        generators = [
+            ctx.Process(target=generate_load, args=(url, tokens, args.concurrency, args.duration, results))
+            for _ in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for generator in generators:
+            generator.start()
+        counts = [results.get() for _ in generators]
+        elapsed = time.perf_counter() - start
+        for generator in generators:
+            generator.join()
+        cpu_after = [cpu_seconds(process.pid) for process, _ in servers]
+    finally:
+        for process, _ in servers:
+            process.terminate()
+        for process, _ in servers:
+            process.join()
+
+    ok = sum(count["ok"] for count in counts)
+    errors = sum(count["errors"] for count in counts)
+    cpu = None
+    if None not in cpu_before and None not in cpu_after:
+        cpu = sum(after - before for before, after in zip(cpu_before, cpu_after))
+
+    rps = ok / elapsed
+    return {
+        "workers": workers,
+        "cache": cache_size > 0,
+        "requests": ok,
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "rps": round(rps, 1),
+        "rps_per_worker": round(rps / workers, 1),
+        "cpu_seconds": round(cpu, 2) if cpu is not None else None,
+        "requests_per_cpu_second": round(ok / cpu, 1) if cpu else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="API worker process counts to measure")
+    parser.add_argument("--cache", choices=["on", "off", "both"], default="both", help="verified-token cache setting")
+    parser.add_argument("--cache-size", type=int, default=1024, help="verified-token cache size when enabled")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per measurement")
+    parser.add_argument("--clients", type=int, default=2, help="load generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent requests per load generator")
+    parser.add_argument("--tokens", type=int, default=100, help="distinct access tokens to rotate through")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    cache_sizes = {"on": [args.cache_size], "off": [0], "both": [args.cache_size, 0]}[args.cache]
+    issuer = LocalIssuer().start()
+    results = []
+    try:
+        print(f"{'workers':>7} {'cache':>5} {'requests':>9} {'errors':>6} {'rps':>9} {'rps/worker':>10} {'req/cpu-s':>10}")
+        for workers in args.workers:
+            for cache_size in cache_sizes:
+                result = run(args, issuer, workers, cache_size)
+                results.append(result)
+                per_cpu = result["requests_per_cpu_second"]
+                print(
+                    f"{result['workers']:>7} {'on' if result['cache'] else 'off':>5} {result['requests']:>9} "
+                    f"{result['errors']:>6} {result['rps']:>9.1f} {result['rps_per_worker']:>10.1f} "
+                    f"{per_cpu if per_cpu is not None else 'n/a':>10}"
+                )
+    finally:
+        issuer.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,29 @@
 Upstream API server that demonstrates a protected resource requiring specific scopes.
 
 This API validates Auth0 JWT tokens and returns authenticated user information.
+Verified claims are cached by token digest, so the repeated calls that MCP tools
+make with the same exchanged token are only verified once. Set `API_WORKERS` to
+serve it from several uvicorn worker processes.
 """
 
 from __future__ import annotations
 
+import contextlib
 import logging
+from collections.abc import AsyncIterator
+from typing import Any
+from urllib.parse import urlparse
 
 from auth0_api_python import ApiClient, ApiClientOptions
 from auth0_api_python.errors import VerifyAccessTokenError
 from starlette.applications import Starlette
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 from starlette.routing import Route
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from ..auth0.cache import TokenCache, token_digest
+from ..auth0.jwks import JwksManager
 from ..config import get_config
 
 config = get_config()
@@ -24,15 +33,24 @@ config = get_config()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# API client for token verification
-api_client = ApiClient(ApiClientOptions(
-    domain=config.auth0_domain,
-    audience=config.api_auth0_audience
-))
-
 
-class Auth0APIMiddleware(BaseHTTPMiddleware):
-    """Middleware that validates Auth0 tokens for the upstream API."""
+class Auth0APIMiddleware:
+    """
+    Pure ASGI middleware that validates Auth0 tokens for the upstream API.
+    When a TokenCache is provided, previously verified tokens are served from it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        client: ApiClient,
+        cache: TokenCache | None = None,
+        jwks: JwksManager | None = None,
+    ):
+        self.app = app
+        self.client = client
+        self.cache = cache
+        self.jwks = jwks
 
     def _error_response(self, error: str, description: str, status: int = 401) -> JSONResponse:
         """Build error response with WWW-Authenticate header."""
@@ -42,39 +60,62 @@ class Auth0APIMiddleware(BaseHTTPMiddleware):
             headers={"WWW-Authenticate": f'Bearer error="{error}"'} if status == 401 else {}
         )
 
-    async def dispatch(self, request: Request, call_next):
+    async def _authenticate(self, token: str) -> dict[str, Any]:
+        digest = token_digest(token) if self.cache is not None else None
+        user = self.cache.get(digest) if digest else None
+        if user is None:
+            if self.jwks is not None:
+                await self.jwks.ensure_key(token)
+            decoded = await self.client.verify_access_token(token, required_claims=["sub"])
+            scopes = decoded.get("scope", "").split()
+            user = {
+                "sub": decoded["sub"],
+                "scope": scopes,
+                # Parsed once per token, require_scope checks are membership tests against it
+                "scope_set": frozenset(scopes),
+                "expires_at": decoded.get("exp"),
+            }
+            if digest:
+                self.cache.set(digest, user)
+        return user
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         auth_header = request.headers.get("authorization")
         if not auth_header or not auth_header.lower().startswith("bearer "):
-            return self._error_response("invalid_token", "Missing or invalid Authorization header")
+            await self._error_response("invalid_token", "Missing or invalid Authorization header")(scope, receive, send)
+            return
 
         try:
-            decoded = await api_client.verify_access_token(
-                auth_header[7:].strip(),
-                required_claims=["sub"]
-            )
-            request.state.user = {
-                "sub": decoded["sub"],
-                "scope": decoded.get("scope", "").split()
-            }
-            return await call_next(request)
+            user = await self._authenticate(auth_header[7:].strip())
         except VerifyAccessTokenError as e:
             logger.info(f"Token verification failed: {e}")
-            return self._error_response("invalid_token", str(e))
-        except Exception as e:
+            await self._error_response("invalid_token", str(e))(scope, receive, send)
+            return
+        except Exception:
             logger.exception("Unexpected error in middleware")
-            return self._error_response("server_error", "Internal server error", 500)
+            await self._error_response("server_error", "Internal server error", 500)(scope, receive, send)
+            return
+
+        request.state.user = user
+        await self.app(scope, receive, send)
 
 
 def require_scope(scope: str):
     """Decorator requiring a specific scope for endpoint access."""
+    forbidden_body = JSONResponse(
+        {"error": "insufficient_scope", "error_description": f"Missing required scope: {scope}"}
+    ).body
+    forbidden_headers = {"WWW-Authenticate": f'Bearer error="insufficient_scope", scope="{scope}"'}
+
     def decorator(func):
         async def wrapper(request: Request) -> Response:
-            if scope not in request.state.user.get("scope", []):
-                return JSONResponse(
-                    {"error": "insufficient_scope", "error_description": f"Missing required scope: {scope}"},
-                    status_code=403,
-                    headers={"WWW-Authenticate": f'Bearer error="insufficient_scope", scope="{scope}"'}
-                )
+            if scope not in request.state.user["scope_set"]:
+                return Response(forbidden_body, status_code=403, headers=forbidden_headers, media_type="application/json")
             return await func(request)
         return wrapper
     return decorator
@@ -91,17 +132,46 @@ async def private_scope_endpoint(request: Request) -> JSONResponse:
     })
 
 
-# Create Starlette app
-app = Starlette(
+def create_app(client: ApiClient, cache: TokenCache | None = None, debug: bool = False) -> Starlette:
+    """Build the upstream API application around an ApiClient configured for its audience."""
+    jwks = JwksManager(lambda: client, refresh_interval=config.jwks_refresh_interval)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        # Prefetch signing keys in the background so steady-state requests never wait on a key fetch
+        async with jwks.run():
+            yield
+
+    return Starlette(
+        debug=debug,
+        routes=[
+            Route("/api/private-scope", private_scope_endpoint, methods=["GET"]),
+        ],
+        middleware=[
+            (Auth0APIMiddleware, [], {"client": client, "cache": cache, "jwks": jwks})
+        ],
+        lifespan=lifespan,
+    )
+
+
+# API client for token verification
+api_client = ApiClient(ApiClientOptions(
+    domain=config.auth0_domain,
+    audience=config.api_auth0_audience
+))
+
+app = create_app(
+    api_client,
+    cache=TokenCache(config.api_token_cache_size, config.api_token_cache_ttl) if config.api_token_cache_size > 0 else None,
     debug=config.debug,
-    routes=[
-        Route("/api/private-scope", private_scope_endpoint, methods=["GET"]),
-    ],
-    middleware=[
-        (Auth0APIMiddleware, [], {})
-    ]
 )
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8787)
+
+    port = urlparse(config.api_base_url).port or 8787
+    if config.api_workers > 1:
+        # Each worker process imports this module and builds its own app, client and cache
+        uvicorn.run("src.api.server:app", host="0.0.0.0", port=port, workers=config.api_workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
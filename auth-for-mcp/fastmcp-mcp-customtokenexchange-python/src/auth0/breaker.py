@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from .errors import ServiceUnavailable
+from .metrics import Auth0Metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(ServiceUnavailable):
+    """
+    Raised when a call is refused because the circuit breaker of its upstream is open.
+
+    Indicates the upstream failed repeatedly and is not called again until
+    `retry_after` seconds have passed.
+    """
+    default_description = "Upstream temporarily unavailable, retry later"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to one upstream.
+
+    The breaker starts closed. After `failure_threshold` consecutive failures it
+    opens, and calls fail immediately with `CircuitOpen` instead of waiting on the
+    upstream. Once `reset_timeout` seconds have passed it lets `half_open_calls`
+    probe calls through: a successful probe closes it again, a failed one reopens
+    it. State transitions are logged and counted in the metrics.
+
+    Args:
+        name: Upstream name, used in log messages and metric labels
+        failure_threshold: Consecutive failures that open the breaker
+        reset_timeout: Seconds the breaker stays open before probing the upstream
+        half_open_calls: Maximum number of concurrent probe calls while half-open
+        metrics: Optional metrics counting state transitions and refused calls
+
+    Raises:
+        ValueError: If failure_threshold or half_open_calls is not positive
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        metrics: Auth0Metrics | None = None,
+    ):
+        if failure_threshold <= 0 or half_open_calls <= 0:
+            raise ValueError("failure_threshold and half_open_calls must be positive")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.metrics = metrics
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    async def call(self, fn: Callable[[], Awaitable[T]], failed: Callable[[T], bool] = lambda result: False) -> T:
+        """
+        Run `fn` unless the breaker is open, and record its outcome.
+
+        Exceptions always count as failures, results count as failures when `failed` returns True.
+
+        Raises:
+            CircuitOpen: If the breaker is open or all probe calls are taken
+        """
+        probe = self._acquire()
+        try:
+            result = await fn()
+        except Exception:
+            self._record(success=False)
+            raise
+        finally:
+            if probe:
+                self._probes -= 1
+        self._record(success=not failed(result))
+        return result
+
+    def _acquire(self) -> bool:
+        """Let a call through, returning whether it is a half-open probe."""
+        if self.state == OPEN:
+            retry_after = self._opened_at + self.reset_timeout - time.monotonic()
+            if retry_after > 0:
+                self._refuse(retry_after)
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_calls:
+                self._refuse(self.reset_timeout)
+            self._probes += 1
+            return True
+        return False
+
+    def _record(self, success: bool) -> None:
+        if success:
+            self.failures = 0
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+            return
+
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self._opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    def _refuse(self, retry_after: float) -> None:
+        if self.metrics is not None:
+            self.metrics.upstream_breaker_rejections.inc(upstream=self.name)
+        raise CircuitOpen(f"Upstream '{self.name}' is unavailable, retry later", retry_after=retry_after)
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        if state == OPEN:
+            logger.warning(
+                f"Circuit breaker for '{self.name}' opened after {self.failures} consecutive failures, "
+                f"probing again in {self.reset_timeout:g} seconds"
+            )
+        else:
+            logger.info(f"Circuit breaker for '{self.name}' {previous} -> {state}")
+        if self.metrics is not None:
+            self.metrics.upstream_breaker_transitions.inc(upstream=self.name, state=state)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from .errors import ServiceUnavailable
+from .metrics import Auth0Metrics
+
+F = TypeVar("F")
+T = TypeVar("T")
+
+# Attribute holding a tool's bulkhead limits, read by Auth0FastMCP when the tool is added
+BULKHEAD_ATTR = "__auth0_bulkhead__"
+
+
+def bulkhead(max_concurrent: int, max_queue: int = 0, timeout: float | None = None):
+    """
+    Decorator that bounds how many calls of a tool run at once.
+
+    Calls beyond `max_concurrent` wait for a free slot, calls beyond `max_queue`
+    waiting ones are rejected immediately, and calls running longer than
+    `timeout` seconds are cancelled. Both rejections raise `ServiceUnavailable`.
+
+    Example:
+      @mcp.tool()
+      @require_scopes(["tool:greet"])
+      @bulkhead(max_concurrent=16, max_queue=32, timeout=15)
+      async def greet(name: str, ctx: Context) -> str:
+        ...
+    """
+    if max_concurrent <= 0 or max_queue < 0:
+        raise ValueError("max_concurrent must be positive and max_queue must not be negative")
+
+    def decorator(func: F) -> F:
+        setattr(func, BULKHEAD_ATTR, {"max_concurrent": max_concurrent, "max_queue": max_queue, "timeout": timeout})
+        return func
+    return decorator
+
+
+class Bulkhead:
+    """
+    Concurrency limit, bounded queue and execution timeout for one tool.
+
+    Args:
+        name: Tool name, used in error messages and metric labels
+        max_concurrent: Maximum number of calls running at once
+        max_queue: Maximum number of calls waiting for a slot, further calls are shed
+        timeout: Seconds a call may run before it is cancelled, None for no limit
+        metrics: Optional metrics recording queue wait time and shed calls
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int = 0,
+        timeout: float | None = None,
+        metrics: Auth0Metrics | None = None,
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.metrics = metrics
+        self.waiting = 0
+        self.shed = 0
+        self.timeouts = 0
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run `call` once a slot is free, or raise ServiceUnavailable if the queue is full or it times out."""
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self._shed("queue_full")
+            raise ServiceUnavailable(f"Tool '{self.name}' is at capacity, retry later")
+
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+            if self.metrics is not None:
+                self.metrics.tool_queue_wait_seconds.observe(time.perf_counter() - start, tool=self.name)
+
+        try:
+            return await asyncio.wait_for(call(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._shed("timeout")
+            raise ServiceUnavailable(f"Tool '{self.name}' timed out after {self.timeout:g} seconds") from None
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of waiting calls and the shed/timeout counters."""
+        return {"waiting": self.waiting, "shed": self.shed, "timeouts": self.timeouts}
+
+    def _shed(self, reason: str) -> None:
+        self.shed += 1
+        if self.metrics is not None:
+            self.metrics.tool_shed.inc(tool=self.name, reason=reason)
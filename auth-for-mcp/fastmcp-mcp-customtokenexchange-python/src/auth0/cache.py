@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def token_digest(token: str) -> str:
+    """Return the SHA-256 hex digest of a raw bearer token, used as a cache key."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    Bounded in-process cache of verified access tokens.
+
+    Maps a token digest to the auth data built from its verified claims, so
+    repeat requests with the same bearer token skip signature verification
+    and claim parsing. Entries expire at the token's `exp` claim or after
+    `max_ttl` seconds, whichever comes first, and the least recently used
+    entry is evicted once `max_size` is reached.
+
+    Args:
+        max_size: Maximum number of verified tokens kept in memory
+        max_ttl: Maximum number of seconds a verified token is trusted without re-verification
+
+    Raises:
+        ValueError: If max_size or max_ttl is not positive
+    """
+
+    def __init__(self, max_size: int = 1024, max_ttl: float = 300.0):
+        if max_size <= 0 or max_ttl <= 0:
+            raise ValueError("max_size and max_ttl must be positive")
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, digest: str) -> dict[str, Any] | None:
+        """Return cached auth data for a token digest, or None on a miss or expired entry."""
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, auth_data = entry
+        if time.time() >= expires_at:
+            del self._entries[digest]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return auth_data
+
+    def set(self, digest: str, auth_data: dict[str, Any]) -> None:
+        """Cache auth data until the token's `exp` claim or the max TTL, whichever is sooner."""
+        expires_at = time.time() + self.max_ttl
+        if exp := auth_data.get("expires_at"):
+            expires_at = min(expires_at, exp)
+
+        self._entries[digest] = (expires_at, auth_data)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the current size and hit/miss counters."""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RejectionCache:
+    """
+    Bounded in-process cache of rejected access tokens.
+
+    Remembers the digests of tokens that failed verification for `ttl` seconds,
+    so replaying the same invalid or expired token is rejected without running
+    signature verification again. The oldest entry is evicted once `max_size`
+    is reached.
+
+    Args:
+        max_size: Maximum number of rejected tokens kept in memory
+        ttl: Number of seconds a rejected token is remembered
+
+    Raises:
+        ValueError: If max_size or ttl is not positive
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0):
+        if max_size <= 0 or ttl <= 0:
+            raise ValueError("max_size and ttl must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self._entries: OrderedDict[str, float] = OrderedDict()
+
+    def __contains__(self, digest: str) -> bool:
+        expires_at = self._entries.get(digest)
+        if expires_at is None:
+            return False
+        if time.monotonic() >= expires_at:
+            del self._entries[digest]
+            return False
+        self.hits += 1
+        return True
+
+    def add(self, digest: str) -> None:
+        self._entries[digest] = time.monotonic() + self.ttl
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        """Return the current size and hit counter."""
+        return {"size": len(self._entries), "hits": self.hits}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .cache import token_digest
+from .metrics import Auth0Metrics
+from .timing import span
+
+if TYPE_CHECKING:
+    from auth0_api_python import ApiClient
+
+logger = logging.getLogger(__name__)
+
+ExchangeKey = tuple[str, str, str | None, str | None]
+
+
+@dataclass
+class _ExchangeEntry:
+    result: dict[str, Any]
+    expires_at: float
+    refresh_at: float
+    # Kept so the background refresher can exchange it again
+    subject_token: str
+    subject_expires_at: float | None
+    last_used: float
+
+
+class TokenExchangeCache:
+    """
+    Caches and de-duplicates Custom Token Exchange results.
+
+    Results are keyed by (subject token digest, subject token type, audience, scope)
+    and reused until `expires_in` minus `expiry_margin` seconds, but never beyond the
+    subject token's own expiry. Concurrent identical exchanges share one request to
+    the token endpoint, and a cached token that is due for refresh is returned
+    immediately while a replacement is exchanged in the background.
+
+    A token is due for refresh once `refresh_fraction` of its lifetime remains, or
+    `refresh_ahead` seconds, whichever is earlier, moved earlier still by a random
+    jitter of up to `refresh_jitter` of its lifetime so tokens issued together are
+    not refreshed together. While `run()` is active, tokens used within the last
+    `refresh_idle` seconds are also refreshed when due without waiting for the next
+    tool call, so long sessions never hit an expired token. At most
+    `refresh_concurrency` background refreshes are sent to the token endpoint at once.
+
+    Args:
+        get_client: Returns the ApiClient configured with client credentials for Custom Token Exchange, called on first use
+        max_size: Maximum number of exchanged tokens kept in memory (0 only de-duplicates)
+        expiry_margin: Seconds subtracted from `expires_in` before a token is considered expired
+        refresh_ahead: Minimum seconds before expiry at which a cached token is refreshed
+        refresh_fraction: Fraction of a token's lifetime remaining at which it is refreshed
+        refresh_jitter: Maximum fraction of a token's lifetime by which a refresh is moved earlier
+        refresh_concurrency: Maximum number of concurrent background refreshes
+        refresh_idle: Seconds after its last use that a token is still refreshed in the background
+        refresh_interval: Seconds between scans for tokens that are due for refresh
+        metrics: Optional metrics recording the latency of exchanges sent to the token endpoint
+    """
+
+    def __init__(
+        self,
+        get_client: Callable[[], ApiClient],
+        max_size: int = 256,
+        expiry_margin: float = 30.0,
+        refresh_ahead: float = 60.0,
+        refresh_fraction: float = 0.2,
+        refresh_jitter: float = 0.05,
+        refresh_concurrency: int = 4,
+        refresh_idle: float = 300.0,
+        refresh_interval: float = 5.0,
+        metrics: Auth0Metrics | None = None,
+    ):
+        self.get_client = get_client
+        self.max_size = max_size
+        self.expiry_margin = expiry_margin
+        self.refresh_ahead = refresh_ahead
+        self.refresh_fraction = refresh_fraction
+        self.refresh_jitter = refresh_jitter
+        self.refresh_idle = refresh_idle
+        self.refresh_interval = refresh_interval
+        self.metrics = metrics
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._refresh_slots = asyncio.Semaphore(refresh_concurrency)
+        self._entries: OrderedDict[ExchangeKey, _ExchangeEntry] = OrderedDict()
+        self._inflight: dict[ExchangeKey, asyncio.Task[dict[str, Any]]] = {}
+
+    @property
+    def client(self) -> ApiClient:
+        return self.get_client()
+
+    async def exchange(
+        self,
+        subject_token: str,
+        subject_token_type: str,
+        audience: str | None = None,
+        scope: str | None = None,
+        subject_expires_at: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Return the result of `get_token_by_exchange_profile` for the given subject token.
+
+        Args:
+            subject_token: The token to be exchanged
+            subject_token_type: URI identifying the token type (must match a Token Exchange Profile)
+            audience: Optional target API identifier for the exchanged token
+            scope: Optional space-separated scopes to request
+            subject_expires_at: Optional `exp` of the subject token, caps how long the result is cached
+        """
+        with span("exchange"):
+            return await self._lookup(subject_token, subject_token_type, audience, scope, subject_expires_at)
+
+    async def _lookup(
+        self,
+        subject_token: str,
+        subject_token_type: str,
+        audience: str | None,
+        scope: str | None,
+        subject_expires_at: float | None,
+    ) -> dict[str, Any]:
+        key = (token_digest(subject_token), subject_token_type, audience, scope)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.expires_at:
+            self.hits += 1
+            entry.last_used = now
+            self._entries.move_to_end(key)
+            if now >= entry.refresh_at and key not in self._inflight:
+                self._start(key, subject_token, subject_expires_at, background=True)
+            return entry.result
+
+        self.misses += 1
+        task = self._inflight.get(key) or self._start(key, subject_token, subject_expires_at)
+        # Shield the shared exchange so a cancelled caller does not cancel it for everyone else
+        return await asyncio.shield(task)
+
+    @contextlib.asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        """Refresh tokens that are in use in the background while the context is open."""
+        task = asyncio.create_task(self._refresh_loop())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def stats(self) -> dict[str, int]:
+        """Return the current size, in-flight exchanges and hit/miss/refresh counters."""
+        return {
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            self._refresh_due()
+
+    def _refresh_due(self) -> None:
+        """Start refreshes for tokens in use that are due, and drop expired tokens."""
+        now = time.time()
+        for key, entry in list(self._entries.items()):
+            if now >= entry.expires_at:
+                del self._entries[key]
+            elif (
+                now >= entry.refresh_at
+                and now - entry.last_used < self.refresh_idle
+                and key not in self._inflight
+                # An exchange with an expired subject token would be rejected
+                and (entry.subject_expires_at is None or now < entry.subject_expires_at)
+            ):
+                self._start(key, entry.subject_token, entry.subject_expires_at, background=True)
+
+    def _start(
+        self,
+        key: ExchangeKey,
+        subject_token: str,
+        subject_expires_at: float | None,
+        background: bool = False,
+    ) -> asyncio.Task[dict[str, Any]]:
+        exchange = self._refresh if background else self._exchange
+        task = asyncio.create_task(exchange(key, subject_token, subject_expires_at))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._on_done(key, t))
+        return task
+
+    def _on_done(self, key: ExchangeKey, task: asyncio.Task[dict[str, Any]]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or (exc := task.exception()) is None:
+            return
+        entry = self._entries.get(key)
+        if entry is not None and time.time() < entry.expires_at:
+            # A background refresh failed, the cached token stays in use until it expires
+            self.refresh_failures += 1
+            logger.warning(f"Token exchange refresh failed: {exc}")
+
+    async def _refresh(self, key: ExchangeKey, subject_token: str, subject_expires_at: float | None) -> dict[str, Any]:
+        async with self._refresh_slots:
+            self.refreshes += 1
+            return await self._exchange(key, subject_token, subject_expires_at)
+
+    async def _exchange(self, key: ExchangeKey, subject_token: str, subject_expires_at: float | None) -> dict[str, Any]:
+        _, subject_token_type, audience, scope = key
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await self.client.get_token_by_exchange_profile(
+                subject_token=subject_token,
+                subject_token_type=subject_token_type,
+                audience=audience,
+                scope=scope
+            )
+            outcome = "success"
+        finally:
+            if self.metrics is not None:
+                self.metrics.token_exchange_seconds.observe(time.perf_counter() - start, outcome=outcome)
+
+        expires_at = result["expires_at"] - self.expiry_margin
+        if subject_expires_at:
+            expires_at = min(expires_at, subject_expires_at)
+
+        now = time.time()
+        if self.max_size > 0 and expires_at > now:
+            lifetime = expires_at - now
+            previous = self._entries.get(key)
+            self._entries[key] = _ExchangeEntry(
+                result=result,
+                expires_at=expires_at,
+                refresh_at=(
+                    expires_at
+                    - max(self.refresh_ahead, lifetime * self.refresh_fraction)
+                    - random.uniform(0, lifetime * self.refresh_jitter)
+                ),
+                subject_token=subject_token,
+                subject_expires_at=subject_expires_at,
+                last_used=previous.last_used if previous is not None else now,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return result
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow upstream calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _label_values(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, optionally split by labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """A distribution of observed values in cumulative buckets, optionally split by labels."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one count per bucket (non-cumulative), plus the sum and the total count
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        counts, totals = self._values.setdefault(key, ([0] * len(self.buckets), [0.0, 0.0]))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        totals[0] += value
+        totals[1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block in seconds, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> Iterator[str]:
+        for key, (counts, (total, count)) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels((*self.labelnames, "le"), (*key, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels((*self.labelnames, "le"), (*key, "+Inf"))
+            yield f"{self.name}_bucket{labels} {int(count)}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {int(count)}"
+
+
+class Auth0Metrics:
+    """
+    Counters and histograms for the MCP auth and tool pipeline, rendered in
+    the Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self.token_verification_seconds = Histogram(
+            "auth0_token_verification_seconds",
+            "Time spent verifying access token signatures and claims, by outcome",
+            ["outcome"],
+        )
+        self.token_cache_requests = Counter(
+            "auth0_token_cache_requests",
+            "Verified-token cache lookups, by result (hit or miss)",
+            ["result"],
+        )
+        self.auth_rejections = Counter(
+            "auth0_auth_rejections",
+            "Requests and tool calls rejected by the auth pipeline, by error code",
+            ["error_code"],
+        )
+        self.tool_call_seconds = Histogram(
+            "mcp_tool_call_seconds",
+            "Time spent handling MCP tool calls, including scope checks and result caching",
+            ["tool"],
+        )
+        self.tool_errors = Counter(
+            "mcp_tool_errors",
+            "MCP tool calls that failed, by tool",
+            ["tool"],
+        )
+        self.tool_queue_wait_seconds = Histogram(
+            "mcp_tool_queue_wait_seconds",
+            "Time MCP tool calls waited for a bulkhead slot, by tool",
+            ["tool"],
+        )
+        self.tool_shed = Counter(
+            "mcp_tool_shed",
+            "MCP tool calls rejected by their bulkhead, by tool and reason (queue_full or timeout)",
+            ["tool", "reason"],
+        )
+        self.token_exchange_seconds = Histogram(
+            "auth0_token_exchange_seconds",
+            "Time spent in Custom Token Exchange requests to the token endpoint, by outcome",
+            ["outcome"],
+        )
+        self.upstream_request_seconds = Histogram(
+            "upstream_request_seconds",
+            "Time until response headers for upstream API requests, by host and status code",
+            ["host", "status"],
+        )
+        self.upstream_hedged_requests = Counter(
+            "upstream_hedged_requests",
+            "Upstream GET requests that were hedged with a second attempt, by upstream and winning attempt",
+            ["upstream", "winner"],
+        )
+        self.upstream_breaker_transitions = Counter(
+            "upstream_breaker_transitions",
+            "Upstream circuit breaker state changes, by upstream and new state",
+            ["upstream", "state"],
+        )
+        self.upstream_breaker_rejections = Counter(
+            "upstream_breaker_rejections",
+            "Upstream calls refused by an open circuit breaker, by upstream",
+            ["upstream"],
+        )
+
+    def metrics(self) -> list[_Metric]:
+        return [value for value in vars(self).values() if isinstance(value, _Metric)]
+
+    def render(self) -> bytes:
+        lines = [line for metric in self.metrics() for line in metric.render()]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    async def endpoint(self, request: Request) -> Response:
+        return Response(self.render(), media_type=CONTENT_TYPE)
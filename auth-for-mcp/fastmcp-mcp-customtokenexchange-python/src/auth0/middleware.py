@@ -1,22 +1,50 @@
+from __future__ import annotations
+
+import functools
 import logging
+import time
 from collections.abc import Callable
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from auth0_api_python import ApiClient, ApiClientOptions
-from auth0_api_python.errors import VerifyAccessTokenError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .cache import RejectionCache, TokenCache, token_digest
+from .errors import AuthenticationRequired, MalformedAuthorizationRequest, TooManyRequests
+from .jwks import JwksManager
+from .metrics import Auth0Metrics
+from .ratelimit import RateLimiter, unverified_client_id
+from .timing import span
 
-from .errors import AuthenticationRequired, MalformedAuthorizationRequest
+if TYPE_CHECKING:
+    from auth0_api_python import ApiClient
 
 logger = logging.getLogger(__name__)
 
-class Auth0Middleware(BaseHTTPMiddleware):
+
+def _api_client(**options: Any) -> ApiClient:
+    # Imported on the first verification, the SDK loads authlib and cryptography
+    from auth0_api_python import ApiClient, ApiClientOptions
+
+    return ApiClient(ApiClientOptions(**options))
+
+
+class Auth0Middleware:
     """
     Middleware that requires a valid Bearer token in the Authorization header.
     Validates the token using Auth0 SDK Client and stores auth info in request.state.auth.
+    Implemented as a pure ASGI middleware so streamed responses pass through untouched.
+    The ApiClient is requested from `get_client` on the first verification, so importing the
+    module does not import the Auth0 SDK.
+    When a TokenCache is provided, previously verified tokens are served from it.
+    When a JwksManager is provided, it is consulted so that unknown signing keys are refreshed.
+    When a RejectionCache is provided, replayed tokens that failed verification are rejected without re-verifying.
+    When a RateLimiter is provided, every rejection counts against the remote address, and addresses that run
+    out of budget get 429 responses before any verification runs. A `client_limiter` does the same per
+    unverified client_id/azp at the remote address, with a tighter budget, so one client cannot use up an
+    address shared by many (for example behind a proxy). The claim is unverified, so it is never limited
+    across addresses, where anyone could use up another client's budget.
+    When Auth0Metrics are provided, cache lookups and verification latency are recorded.
     """
 
     def __init__(
@@ -25,28 +53,51 @@ class Auth0Middleware(BaseHTTPMiddleware):
         domain: str,
         audience: str,
         client_id: str | None = None,
-        client_secret: str | None = None
+        client_secret: str | None = None,
+        cache: TokenCache | None = None,
+        get_client: Callable[[], ApiClient] | None = None,
+        jwks: JwksManager | None = None,
+        rejections: RejectionCache | None = None,
+        limiter: RateLimiter | None = None,
+        client_limiter: RateLimiter | None = None,
+        metrics: Auth0Metrics | None = None
     ):
-        super().__init__(app)
+        self.app = app
         if not domain or not audience:
             raise RuntimeError("domain and audience must be provided")
-        self.client = ApiClient(ApiClientOptions(
+        self.get_client = get_client or functools.cache(functools.partial(
+            _api_client,
             domain=domain,
             audience=audience,
             client_id=client_id,
             client_secret=client_secret
         ))
+        self.cache = cache
+        self.jwks = jwks
+        self.rejections = rejections
+        self.limiter = limiter
+        self.client_limiter = client_limiter
+        self.metrics = metrics
+
+    @property
+    def client(self) -> ApiClient:
+        return self.get_client()
 
     def _build_auth_data(self, token: dict[str, Any], raw_token: str) -> dict[str, Any]:
         """Extract authentication data from verified token."""
         client_id = token.get('client_id') or token.get('azp')
         if not client_id:
+            from auth0_api_python.errors import VerifyAccessTokenError
             raise VerifyAccessTokenError("Token missing 'client_id' or 'azp' claim")
 
+        scopes = token.get("scope", "").split()
+
         auth_data = {
             "token": raw_token,
             "client_id": client_id,
-            "scopes": token.get("scope", "").split(),
+            "scopes": scopes,
+            # Parsed once per token, tool scope checks are subset tests against it
+            "scope_set": frozenset(scopes),
             "extra": {k: token[k] for k in ('sub', 'azp', 'name', 'email', 'client_id') if k in token}
         }
 
@@ -55,31 +106,100 @@ class Auth0Middleware(BaseHTTPMiddleware):
 
         return auth_data
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Extract Authorization header
-        auth_header = request.headers.get("authorization")
-        if not auth_header:
-            raise MalformedAuthorizationRequest("Missing Authorization header")
-        if not auth_header.lower().startswith("bearer "):
-            raise MalformedAuthorizationRequest("Invalid Authorization header format")
+    async def authenticate(self, token: str, address: str | None = None) -> dict[str, Any]:
+        """
+        Verify a bearer token, or serve it from the cache, and return its auth data.
 
-        # Extract and verify token
-        token = auth_header[7:].strip() # Remove "Bearer " prefix
-        try:
-            decoded_and_verified_token = await self.client.verify_access_token(
-                token,
-                required_claims=["sub"]
-            )
+        Raises:
+            AuthenticationRequired: If the token is invalid or was rejected recently
+            TooManyRequests: If the token's client ID or the remote address sent too many invalid tokens
+        """
+        digest = token_digest(token) if self.cache is not None or self.rejections is not None else None
+        with span("token_cache"):
+            auth_data = self.cache.get(digest) if self.cache is not None else None
+        if self.cache is not None and self.metrics is not None:
+            self.metrics.token_cache_requests.inc(result="hit" if auth_data is not None else "miss")
+        if auth_data is not None:
+            return auth_data
 
-            # Set up authentication context
-            request.state.auth = self._build_auth_data(decoded_and_verified_token, token)
-            # Store the API client for CTE usage
-            request.state.api_client = self.client
+        if self.rejections is not None and digest in self.rejections:
+            raise AuthenticationRequired("Invalid token")
+
+        limits = self._limits(token, address)
+        for limiter, key in limits:
+            if retry_after := limiter.retry_after(key):
+                raise TooManyRequests(retry_after=retry_after)
 
-            return await call_next(request)
+        from auth0_api_python.errors import VerifyAccessTokenError
+
+        start = time.perf_counter()
+        try:
+            with span("verify"):
+                if self.jwks is not None:
+                    await self.jwks.ensure_key(token)
+                decoded_and_verified_token = await self.client.verify_access_token(
+                    token,
+                    required_claims=["sub"]
+                )
+                auth_data = self._build_auth_data(decoded_and_verified_token, token)
         except VerifyAccessTokenError:
+            self._observe_verification(start, "invalid")
+            if self.rejections is not None:
+                self.rejections.add(digest)
+            for limiter, key in limits:
+                limiter.consume(key)
             logger.info("Token verification failed")
-            raise AuthenticationRequired("Invalid token")
+            raise AuthenticationRequired("Invalid token") from None
+        self._observe_verification(start, "valid")
+
+        if self.cache is not None:
+            self.cache.set(digest, auth_data)
+        return auth_data
+
+    def _observe_verification(self, start: float, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.token_verification_seconds.observe(time.perf_counter() - start, outcome=outcome)
+
+    def _limits(self, token: str, address: str | None) -> list[tuple[RateLimiter, str]]:
+        """Return the limiters and keys that a rejection of the token counts against."""
+        if not address:
+            return []
+        limits = []
+        if self.limiter is not None:
+            limits.append((self.limiter, address))
+        if self.client_limiter is not None and (client_id := unverified_client_id(token)):
+            limits.append((self.client_limiter, f"{client_id}@{address}"))
+        return limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        # Extract Authorization header
+        with span("header"):
+            auth_header = request.headers.get("authorization")
+            if not auth_header:
+                raise MalformedAuthorizationRequest("Missing Authorization header")
+            if not auth_header.lower().startswith("bearer "):
+                raise MalformedAuthorizationRequest("Invalid Authorization header format")
+
+        # Extract and verify token
+        token = auth_header[7:].strip() # Remove "Bearer " prefix
+        address = scope["client"][0] if scope.get("client") else None
+        try:
+            auth_data = await self.authenticate(token, address)
+        except (AuthenticationRequired, TooManyRequests):
+            raise
         except Exception:
             logger.exception("Unexpected error in middleware")
             raise
+
+        # Set up authentication context
+        request.state.auth = auth_data
+        # Store the API client for CTE usage
+        request.state.api_client = self.client
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import base64
+import json
+import time
+from collections import OrderedDict
+
+
+def unverified_client_id(token: str) -> str | None:
+    """
+    Return the `client_id` or `azp` claim of a JWT without verifying it.
+
+    Only suitable as a rate limiting key, never for authorization decisions.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except Exception:
+        return None
+    if not isinstance(claims, dict):
+        return None
+    client_id = claims.get("client_id") or claims.get("azp")
+    return client_id if isinstance(client_id, str) else None
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter over a bounded set of keys.
+
+    Each key owns a bucket holding up to `burst` tokens that refills at `rate`
+    tokens per second. `consume()` takes a token for an event, and `retry_after()`
+    reports how long a key has to wait for its next token, without taking one.
+    Buckets for the least recently seen keys are dropped once `max_keys` is
+    reached, which resets them to a full bucket.
+
+    Args:
+        rate: Tokens added to each bucket per second
+        burst: Capacity of each bucket
+        max_keys: Maximum number of buckets kept in memory
+
+    Raises:
+        ValueError: If rate, burst or max_keys is not positive
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        if rate <= 0 or burst <= 0 or max_keys <= 0:
+            raise ValueError("rate, burst and max_keys must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def retry_after(self, key: str) -> float:
+        """Return the seconds until the key has a token available, 0 if it has one now."""
+        tokens = self._tokens(key, time.monotonic())
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def consume(self, key: str) -> None:
+        """Take one token from the key's bucket, never going below empty."""
+        now = time.monotonic()
+        self._buckets[key] = (max(self._tokens(key, now) - 1, 0.0), now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def _tokens(self, key: str, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return float(self.burst)
+        tokens, updated_at = bucket
+        return min(tokens + (now - updated_at) * self.rate, float(self.burst))
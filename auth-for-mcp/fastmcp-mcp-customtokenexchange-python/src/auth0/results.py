@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F")
+
+ResultKey = tuple[str, str, str, str | None]
+
+# Attribute holding a tool's result TTL override, read by Auth0FastMCP when the tool is added
+RESULT_TTL_ATTR = "__auth0_result_ttl__"
+
+
+def result_ttl(seconds: float):
+    """
+    Decorator that overrides how long results of a read-only tool are cached.
+
+    Use `0` for read-only tools whose result changes on every call, or depends on
+    anything other than their arguments and the token's `sub` (and `iss`), such as
+    the token's scopes or client ID. Those are not part of the cache key, so a cached
+    result would be served to other tokens of the same user.
+
+    Example:
+      @mcp.tool(..., annotations={"readOnlyHint": True})
+      @result_ttl(0)
+      async def get_datetime() -> str:
+        ...
+    """
+    def decorator(func: F) -> F:
+        setattr(func, RESULT_TTL_ATTR, seconds)
+        return func
+    return decorator
+
+
+def result_key(tool: str, arguments: dict[str, Any], sub: str, issuer: str | None = None) -> ResultKey:
+    """Return the cache key for a tool call: (tool name, canonical JSON arguments, subject, issuer)."""
+    return tool, json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str), sub, issuer
+
+
+@dataclass
+class _ResultEntry:
+    result: Any
+    fresh_until: float
+    stale_until: float
+
+
+class ToolResultCache:
+    """
+    Caches results of read-only MCP tools per user.
+
+    Results are keyed by (tool name, canonical arguments, `sub`, `iss`), so users
+    of different tenants never share results, and served from memory for the
+    tool's TTL. Every token of a user shares the user's entries, so a cacheable
+    tool may only depend on its arguments and `sub`. For a further `stale_ttl` seconds a stale result is still returned
+    immediately while the tool runs again in the background to replace it.
+    Concurrent identical calls share one execution, failed calls are never
+    cached, and the least recently used entry is evicted once `max_size` is
+    reached.
+
+    Args:
+        max_size: Maximum number of tool results kept in memory
+        ttl: Default number of seconds a result is fresh, tools can override it with `@result_ttl`
+        stale_ttl: Seconds after expiry during which a stale result is served while it is refreshed
+
+    Raises:
+        ValueError: If max_size is not positive
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0, stale_ttl: float = 30.0):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[ResultKey, _ResultEntry] = OrderedDict()
+        self._inflight: dict[ResultKey, asyncio.Task[Any]] = {}
+
+    async def get_or_call(self, key: ResultKey, ttl: float, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result for the key, or run `call` and cache its result for `ttl` seconds."""
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.stale_until:
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start(key, ttl, call)
+            return entry.result
+
+        self.misses += 1
+        task = self._inflight.get(key) or self._start(key, ttl, call)
+        # Shield the shared call so a cancelled caller does not cancel it for everyone else
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the current size, in-flight calls and hit/miss counters."""
+        return {
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def _start(self, key: ResultKey, ttl: float, call: Callable[[], Awaitable[Any]]) -> asyncio.Task[Any]:
+        task = asyncio.create_task(self._call(key, ttl, call))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._on_done(key, t))
+        return task
+
+    def _on_done(self, key: ResultKey, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or (exc := task.exception()) is None:
+            return
+        if key in self._entries:
+            # A background refresh failed, the stale result is served until it ages out
+            logger.warning(f"Tool result refresh failed for '{key[0]}': {exc}")
+
+    async def _call(self, key: ResultKey, ttl: float, call: Callable[[], Awaitable[Any]]) -> Any:
+        result = await call()
+
+        fresh_until = time.monotonic() + ttl
+        self._entries[key] = _ResultEntry(result, fresh_until, fresh_until + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        return result
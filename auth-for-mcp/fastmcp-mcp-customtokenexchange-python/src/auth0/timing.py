@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Timing of the request being handled, None when Server-Timing is disabled
+_current: ContextVar[ServerTiming | None] = ContextVar("server_timing", default=None)
+
+
+class ServerTiming:
+    """Durations of the named spans of one request, summed per name in the order they were first recorded."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.spans: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def header_value(self) -> str:
+        """Render the spans recorded so far and the elapsed total as a Server-Timing header value."""
+        spans = [*self.spans.items(), ("total", self.elapsed())]
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in spans)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record the duration of the block as a span of the current request, if it is being timed."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+@contextmanager
+def timed_by(timing: ServerTiming | None) -> Iterator[None]:
+    """
+    Make `timing` the current request's timing for the block.
+
+    Stateful MCP sessions handle messages in a task that outlives the request
+    which opened the session, so tool calls select their request's timing
+    explicitly instead of inheriting it.
+    """
+    token = _current.set(timing)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware that times the spans of each request.
+
+    A `ServerTiming` is stored in `request.state.server_timing` and made current
+    for the request, so `span()` blocks anywhere in the auth and tool pipeline
+    record into it. The spans recorded before the response headers are sent go
+    into a `Server-Timing` header. Streamable HTTP answers POST requests with a
+    server-sent event stream whose headers are ready before the tool has run, so
+    for POST requests the headers are held back until the first event, which
+    carries the result of a tool call. Spans recorded after the headers were
+    sent, such as those of events later in a long stream, only appear in the
+    log line. With `log` enabled, one structured log line with all spans is
+    written when the response completes.
+
+    Args:
+        app: The ASGI application to wrap
+        log: Whether to log the spans of every request
+    """
+
+    def __init__(self, app: ASGIApp, log: bool = False):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = ServerTiming()
+        scope.setdefault("state", {})["server_timing"] = timing
+        defer_start = scope["method"] == "POST"
+        start_message: Message | None = None
+        status = 0
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal start_message, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                start_message = message
+                if defer_start:
+                    return
+            if start_message is not None:
+                headers = [*start_message.get("headers", []), (b"server-timing", timing.header_value().encode("latin-1"))]
+                await send({**start_message, "headers": headers})
+                start_message = None
+                if message["type"] == "http.response.start":
+                    return
+            await send(message)
+            if self.log and message["type"] == "http.response.body" and not message.get("more_body", False):
+                self._log(scope, status, timing)
+
+        with timed_by(timing):
+            await self.app(scope, receive, send_with_timing)
+
+    def _log(self, scope: Scope, status: int, timing: ServerTiming) -> None:
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status,
+            **{name: round(seconds * 1000, 3) for name, seconds in timing.spans.items()},
+            "total": round(timing.elapsed() * 1000, 3),
+        }
+        logger.info(f"server_timing {json.dumps(record)}")
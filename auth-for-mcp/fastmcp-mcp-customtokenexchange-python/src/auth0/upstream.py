@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib.util
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from .breaker import CircuitBreaker
+from .metrics import Auth0Metrics
+from .timing import span
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamClient:
+    """
+    Shared, pooled HTTP client for MCP tools that call upstream APIs.
+
+    The underlying `httpx.AsyncClient` is created when `run()` is entered from the
+    server lifespan and closed when it exits, so tool calls reuse warm connections
+    and TLS sessions instead of opening a new client per call.
+
+    Requests made with `get()` also go through a circuit breaker per host, so a
+    failing upstream is refused immediately instead of piling up waiting calls,
+    and are hedged: when no response arrives within `hedge_delay` seconds, the
+    same GET is sent again and whichever response arrives first is used.
+
+    Args:
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Maximum number of idle connections kept alive
+        keepalive_expiry: Seconds an idle connection is kept alive
+        http2: Enable HTTP/2 (requires the `h2` package, falls back to HTTP/1.1 without it)
+        timeout: Default timeout in seconds for upstream requests
+        host_timeouts: Per-host timeout overrides in seconds, keyed by "host" or "host:port"
+        hedge_delay: Seconds to wait for a response before hedging a GET with a second request (0 disables hedging)
+        breaker_failures: Consecutive failures (errors or 5xx responses) that open a host's circuit breaker
+        breaker_reset_timeout: Seconds a host's circuit breaker stays open before a probe request is let through
+        metrics: Optional metrics recording upstream latency, hedged requests and circuit breaker state changes
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 10.0,
+        host_timeouts: dict[str, float] | None = None,
+        hedge_delay: float = 0.0,
+        breaker_failures: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        metrics: Auth0Metrics | None = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.timeout = httpx.Timeout(timeout)
+        self.host_timeouts = {host: httpx.Timeout(value) for host, value in (host_timeouts or {}).items()}
+        self.hedge_delay = hedge_delay
+        self.breaker_failures = breaker_failures
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self.metrics = metrics
+        self._client: httpx.AsyncClient | None = None
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("UpstreamClient is not running, enter `run()` from the server lifespan")
+        return self._client
+
+    async def get(self, url: str, hedge_delay: float | None = None, **kwargs: Any) -> httpx.Response:
+        """
+        Send a GET request through the host's circuit breaker, hedging it when it is slow.
+
+        Args:
+            url: URL to request
+            hedge_delay: Overrides the client's `hedge_delay` for this request (0 disables hedging)
+            **kwargs: Passed to `httpx.AsyncClient.get`
+
+        Raises:
+            CircuitOpen: If the host's circuit breaker is open
+            httpx.HTTPError: If the request fails
+        """
+        delay = self.hedge_delay if hedge_delay is None else hedge_delay
+        host = httpx.URL(url).netloc.decode("ascii")
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(
+                host,
+                failure_threshold=self.breaker_failures,
+                reset_timeout=self.breaker_reset_timeout,
+                metrics=self.metrics,
+            )
+        with span("upstream"):
+            return await breaker.call(
+                lambda: self._hedged_get(host, url, delay, **kwargs),
+                failed=lambda response: response.status_code >= 500,
+            )
+
+    def breaker(self, host: str) -> CircuitBreaker | None:
+        """Return the circuit breaker for a "host[:port]", None if it was never called."""
+        return self._breakers.get(host)
+
+    async def _hedged_get(self, host: str, url: str, delay: float, **kwargs: Any) -> httpx.Response:
+        if delay <= 0:
+            return await self.client.get(url, **kwargs)
+
+        primary = asyncio.create_task(self.client.get(url, **kwargs))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            # GET is idempotent, so a second attempt is safe; the first response wins
+            hedge = asyncio.create_task(self.client.get(url, **kwargs))
+            tasks.add(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    self._observe_hedge(host, "hedge" if winners[0] is hedge else "primary")
+                    return winners[0].result()
+            self._observe_hedge(host, "failed")
+            return primary.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _observe_hedge(self, host: str, winner: str) -> None:
+        if self.metrics is not None:
+            self.metrics.upstream_hedged_requests.inc(upstream=host, winner=winner)
+
+    @contextlib.asynccontextmanager
+    async def run(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Create the pooled client for the lifetime of the context and close it afterwards."""
+        http2 = self.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+            http2 = False
+
+        request_hooks = [self._apply_host_timeout] if self.host_timeouts else []
+        response_hooks = []
+        if self.metrics is not None:
+            request_hooks.append(self._start_timer)
+            response_hooks.append(self._observe_latency)
+
+        async with httpx.AsyncClient(
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=http2,
+            event_hooks={"request": request_hooks, "response": response_hooks},
+        ) as client:
+            self._client = client
+            try:
+                yield client
+            finally:
+                self._client = None
+
+    async def _apply_host_timeout(self, request: httpx.Request) -> None:
+        url = request.url
+        timeout = self.host_timeouts.get(f"{url.host}:{url.port}") or self.host_timeouts.get(url.host)
+        if timeout is not None:
+            request.extensions["timeout"] = timeout.as_dict()
+
+    async def _start_timer(self, request: httpx.Request) -> None:
+        request.extensions["upstream_start"] = time.perf_counter()
+
+    async def _observe_latency(self, response: httpx.Response) -> None:
+        start = response.request.extensions.get("upstream_start")
+        if start is not None:
+            self.metrics.upstream_request_seconds.observe(
+                time.perf_counter() - start,
+                host=response.request.url.host,
+                status=str(response.status_code),
+            )
@@ -9,6 +9,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def parse_host_timeouts(value: str) -> dict[str, float]:
+    """Parse comma-separated "host[:port]=seconds" pairs, e.g. "localhost:8787=5,api.example.com=2"."""
+    host_timeouts = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        host, _, seconds = item.rpartition("=")
+        if not host:
+            raise ValueError(f"Invalid host timeout '{item}', expected host=seconds")
+        host_timeouts[host] = float(seconds)
+    return host_timeouts
+
+
 class Config:
     """Application configuration loaded from environment variables."""
 
@@ -22,15 +33,70 @@ class Config:
     mcp_auth0_subject_token_type: str = os.getenv("MCP_AUTH0_SUBJECT_TOKEN_TYPE", "")
     mcp_auth0_exchange_scope: str = os.getenv("MCP_AUTH0_EXCHANGE_SCOPE", "")
 
+    # Custom Token Exchange result cache
+    token_exchange_cache_size: int = int(os.getenv("TOKEN_EXCHANGE_CACHE_SIZE", "256"))
+    token_exchange_expiry_margin: float = float(os.getenv("TOKEN_EXCHANGE_EXPIRY_MARGIN", "30"))
+    token_exchange_refresh_ahead: float = float(os.getenv("TOKEN_EXCHANGE_REFRESH_AHEAD", "60"))
+    token_exchange_refresh_fraction: float = float(os.getenv("TOKEN_EXCHANGE_REFRESH_FRACTION", "0.2"))
+    token_exchange_refresh_jitter: float = float(os.getenv("TOKEN_EXCHANGE_REFRESH_JITTER", "0.05"))
+    token_exchange_refresh_concurrency: int = int(os.getenv("TOKEN_EXCHANGE_REFRESH_CONCURRENCY", "4"))
+    token_exchange_refresh_idle: float = float(os.getenv("TOKEN_EXCHANGE_REFRESH_IDLE", "300"))
+
     # Upstream API configuration
     api_auth0_audience: str = os.getenv("API_AUTH0_AUDIENCE", "")
     api_base_url: str = os.getenv("API_BASE_URL", "http://localhost:8787")
 
+    # Upstream API worker processes and its verified-token cache (size 0 disables it)
+    api_workers: int = int(os.getenv("API_WORKERS", "1"))
+    api_token_cache_size: int = int(os.getenv("API_TOKEN_CACHE_SIZE", "1024"))
+    api_token_cache_ttl: float = float(os.getenv("API_TOKEN_CACHE_TTL", "300"))
+
+    # Pooled HTTP client used by tools to call upstream APIs
+    upstream_max_connections: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+    upstream_max_keepalive_connections: int = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    upstream_keepalive_expiry: float = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+    upstream_http2: bool = os.getenv("UPSTREAM_HTTP2", "false").lower() == "true"
+    upstream_timeout: float = float(os.getenv("UPSTREAM_TIMEOUT", "10"))
+    upstream_host_timeouts: dict[str, float] = parse_host_timeouts(os.getenv("UPSTREAM_HOST_TIMEOUTS", ""))
+    upstream_hedge_delay: float = float(os.getenv("UPSTREAM_HEDGE_DELAY", "0"))
+    upstream_breaker_failures: int = int(os.getenv("UPSTREAM_BREAKER_FAILURES", "5"))
+    upstream_breaker_reset_timeout: float = float(os.getenv("UPSTREAM_BREAKER_RESET_TIMEOUT", "30"))
+
     # Server configuration
     port: int = int(os.getenv("PORT", "3001"))
     mcp_server_url: str = os.getenv("MCP_SERVER_URL", f"http://localhost:{port}")
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
 
+    # Verified-token cache configuration
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+    token_cache_ttl: float = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+
+    # Seconds between background refreshes of the Auth0 signing keys
+    jwks_refresh_interval: float = float(os.getenv("JWKS_REFRESH_INTERVAL", "600"))
+
+    # Seconds clients may cache the Protected Resource Metadata (0 makes them revalidate with the ETag)
+    metadata_max_age: int = int(os.getenv("METADATA_MAX_AGE", "0"))
+
+    # Rejected-token cache, and rate limits on rejections per address and per client ID at an address (0 disables any)
+    rejection_cache_size: int = int(os.getenv("REJECTION_CACHE_SIZE", "1024"))
+    rejection_cache_ttl: float = float(os.getenv("REJECTION_CACHE_TTL", "30"))
+    rejection_rate: float = float(os.getenv("REJECTION_RATE", "1"))
+    rejection_burst: int = int(os.getenv("REJECTION_BURST", "20"))
+    client_rejection_rate: float = float(os.getenv("CLIENT_REJECTION_RATE", "0.2"))
+    client_rejection_burst: int = int(os.getenv("CLIENT_REJECTION_BURST", "5"))
+
+    # Opt-in result cache for read-only tools (0 disables it)
+    tool_result_cache_size: int = int(os.getenv("TOOL_RESULT_CACHE_SIZE", "0"))
+    tool_result_cache_ttl: float = float(os.getenv("TOOL_RESULT_CACHE_TTL", "30"))
+    tool_result_cache_stale_ttl: float = float(os.getenv("TOOL_RESULT_CACHE_STALE_TTL", "30"))
+
+    # Serve Prometheus metrics at /metrics
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+
+    # Server-Timing header with per-request auth and tool spans, optionally logged as well
+    server_timing: bool = os.getenv("SERVER_TIMING", "false").lower() == "true"
+    server_timing_log: bool = os.getenv("SERVER_TIMING_LOG", "false").lower() == "true"
+
     # CORS configuration
     cors_origins: list[str] = os.getenv("CORS_ORIGINS", "*").split(",")
 
@@ -9,6 +9,7 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
 
 from .auth0 import Auth0Mcp
+from .auth0.upstream import UpstreamClient
 from .config import get_config
 from .tools import register_tools
 
@@ -24,13 +25,52 @@ auth0_mcp = Auth0Mcp(
     domain=config.auth0_domain,
     client_id=config.mcp_auth0_client_id,
     client_secret=config.mcp_auth0_client_secret,
-    mcp_server_url=config.mcp_server_url
+    mcp_server_url=config.mcp_server_url,
+    token_cache_size=config.token_cache_size,
+    token_cache_ttl=config.token_cache_ttl,
+    jwks_refresh_interval=config.jwks_refresh_interval,
+    metadata_max_age=config.metadata_max_age,
+    server_timing=config.server_timing,
+    server_timing_log=config.server_timing_log,
+    rejection_cache_size=config.rejection_cache_size,
+    rejection_cache_ttl=config.rejection_cache_ttl,
+    rejection_rate=config.rejection_rate,
+    rejection_burst=config.rejection_burst,
+    client_rejection_rate=config.client_rejection_rate,
+    client_rejection_burst=config.client_rejection_burst,
+    tool_result_cache_size=config.tool_result_cache_size,
+    tool_result_cache_ttl=config.tool_result_cache_ttl,
+    tool_result_cache_stale_ttl=config.tool_result_cache_stale_ttl,
+    token_exchange_cache_size=config.token_exchange_cache_size,
+    token_exchange_expiry_margin=config.token_exchange_expiry_margin,
+    token_exchange_refresh_ahead=config.token_exchange_refresh_ahead,
+    token_exchange_refresh_fraction=config.token_exchange_refresh_fraction,
+    token_exchange_refresh_jitter=config.token_exchange_refresh_jitter,
+    token_exchange_refresh_concurrency=config.token_exchange_refresh_concurrency,
+    token_exchange_refresh_idle=config.token_exchange_refresh_idle,
+    upstream=UpstreamClient(
+        max_connections=config.upstream_max_connections,
+        max_keepalive_connections=config.upstream_max_keepalive_connections,
+        keepalive_expiry=config.upstream_keepalive_expiry,
+        http2=config.upstream_http2,
+        timeout=config.upstream_timeout,
+        host_timeouts=config.upstream_host_timeouts,
+        hedge_delay=config.upstream_hedge_delay,
+        breaker_failures=config.upstream_breaker_failures,
+        breaker_reset_timeout=config.upstream_breaker_reset_timeout,
+    ),
 )
 register_tools(auth0_mcp)
 
 @contextlib.asynccontextmanager
 async def lifespan(app: Starlette) -> AsyncIterator[None]:
     async with contextlib.AsyncExitStack() as stack:
+        # Prefetch signing keys in the background and keep them fresh so steady-state verification never waits on a key fetch
+        await stack.enter_async_context(auth0_mcp.jwks.run())
+        # Open the pooled HTTP client that tools use for upstream API calls
+        await stack.enter_async_context(auth0_mcp.upstream.run())
+        # Refresh exchanged tokens that are in use before they expire
+        await stack.enter_async_context(auth0_mcp.token_exchange.run())
         await stack.enter_async_context(auth0_mcp.mcp.session_manager.run())
         yield
 
@@ -38,7 +78,10 @@ starlette_app = Starlette(
     debug=config.debug,
     routes=[
         # Add discovery metadata route
-        Mount("/", app=auth0_mcp.auth_metadata_router()),
+        *auth0_mcp.auth_metadata_router().routes,
+
+        # Prometheus metrics for the auth and tool pipeline
+        *(auth0_mcp.metrics_router().routes if config.metrics_enabled else []),
 
         # Main MCP app route with authentication middleware
         Mount(
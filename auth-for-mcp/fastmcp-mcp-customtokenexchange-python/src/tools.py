@@ -1,11 +1,12 @@
 import json
 import logging
 
-import httpx
 from mcp.server.fastmcp import Context
 
 from .auth0 import Auth0Mcp
 from .auth0.authz import register_required_scopes, require_scopes
+from .auth0.bulkhead import bulkhead
+from .auth0.results import result_ttl
 from .config import get_config
 
 logger = logging.getLogger(__name__)
@@ -18,13 +19,14 @@ def register_tools(auth0_mcp: Auth0Mcp) -> None:
     mcp = auth0_mcp.mcp
     config = get_config()
 
-    async def exchange_custom_token(api_client, subject_token: str) -> dict:
-        """Exchange subject token for access token via Custom Token Exchange."""
-        result = await api_client.get_token_by_exchange_profile(
-            subject_token=subject_token,
+    async def exchange_custom_token(auth_info: dict) -> dict:
+        """Exchange subject token for access token via Custom Token Exchange (cached until near expiry)."""
+        result = await auth0_mcp.token_exchange.exchange(
+            subject_token=auth_info["token"],
             subject_token_type=config.mcp_auth0_subject_token_type,
             audience=config.api_auth0_audience,
-            scope=config.mcp_auth0_exchange_scope or None
+            scope=config.mcp_auth0_exchange_scope or None,
+            subject_expires_at=auth_info.get("expires_at")
         )
         return {"token": result["access_token"], "scopes": result.get("scope", "")}
 
@@ -36,6 +38,7 @@ def register_tools(auth0_mcp: Auth0Mcp) -> None:
         annotations={"readOnlyHint": True}
     )
     @require_scopes(["tool:whoami"])
+    @result_ttl(0)  # The result includes the token's scopes and client, not only its `sub`
     async def whoami(ctx: Context) -> str:
         auth_info = ctx.request_context.request.state.auth
 
@@ -53,6 +56,8 @@ def register_tools(auth0_mcp: Auth0Mcp) -> None:
         annotations={"readOnlyHint": True}
     )
     @require_scopes(["tool:greet"])
+    # Bound the calls waiting on the token endpoint and upstream API, so a slow upstream cannot starve the other tools
+    @bulkhead(max_concurrent=32, max_queue=64, timeout=30)
     async def greet(name: str, ctx: Context) -> str:
         user_name = name.strip() if name else "there"
         auth_info = ctx.request_context.request.state.auth
@@ -61,18 +66,16 @@ def register_tools(auth0_mcp: Auth0Mcp) -> None:
         logger.info(f"Greet tool invoked for user: {user_id}")
 
         # Exchange token and call upstream API
-        exchange_result = await exchange_custom_token(
-            ctx.request_context.request.state.api_client,
-            auth_info["token"]
-        )
+        exchange_result = await exchange_custom_token(auth_info)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{config.api_base_url}/api/private-scope",
-                headers={"authorization": f"Bearer {exchange_result['token']}"}
-            )
-            upstream_result = response.json()
-            logger.info(f"Upstream API response: {upstream_result}")
+        # Reuse the pooled client so upstream calls share warm connections, behind the
+        # upstream's circuit breaker so a failing API is refused instead of awaited
+        response = await auth0_mcp.upstream.get(
+            f"{config.api_base_url}/api/private-scope",
+            headers={"authorization": f"Bearer {exchange_result['token']}"}
+        )
+        upstream_result = response.json()
+        logger.info(f"Upstream API response: {upstream_result}")
 
         return f"""Hello, {user_name} ({user_id})!
 Upstream API Response: {json.dumps(upstream_result, indent=2)}"""
@@ -84,6 +87,7 @@ Upstream API Response: {json.dumps(upstream_result, indent=2)}"""
         description="Returns the current UTC date and time",
         annotations={"readOnlyHint": True}
     )
+    @result_ttl(0)  # The result changes on every call, never cache it
     async def get_datetime() -> str:
         """Returns the current UTC date and time"""
         from datetime import datetime, timezone
@@ -0,0 +1,225 @@
+"""
+Compare the pure-ASGI Auth0Middleware against the previous BaseHTTPMiddleware
+implementation on a streaming response.
+
+Both variants run the same authentication logic against a pre-populated token
+cache, so the numbers isolate the cost of the middleware plumbing itself. The
+ASGI app is driven in-process, without a network stack, and the benchmark
+reports throughput and time to first byte (TTFB) for each variant.
+
+Usage:
+    poetry run python -m benchmarks.asgi_middleware --requests 2000 --concurrency 32 --chunks 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from collections.abc import Callable
+
+from mcp.server.fastmcp import Context, FastMCP
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.applications import Starlette
+from starlette.types import ASGIApp, Message
+
+from src.auth0.cache import TokenCache, token_digest
+from src.auth0.errors import MalformedAuthorizationRequest
+from src.auth0.middleware import Auth0Middleware
+
+TOKEN = "benchmark-token"
+AUTH_DATA = {
+    "client_id": "benchmark-client",
+    "scopes": ["tool:stream"],
+    "expires_at": int(time.time()) + 86400,
+    "extra": {"sub": "benchmark|user"},
+}
+
+
+class BaseHTTPAuth0Middleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware-based dispatch, kept here for comparison."""
+
+    def __init__(self, app: ASGIApp, auth: Auth0Middleware):
+        super().__init__(app)
+        self.auth = auth
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        auth_header = request.headers.get("authorization")
+        if not auth_header or not auth_header.lower().startswith("bearer "):
+            raise MalformedAuthorizationRequest("Invalid Authorization header format")
+        request.state.auth = await self.auth.authenticate(auth_header[7:].strip())
+        return await call_next(request)
+
+
+def build_raw_app(chunks: int) -> ASGIApp:
+    """A Starlette endpoint that streams `chunks` server-sent events."""
+    async def stream(request: Request) -> StreamingResponse:
+        sub = request.state.auth["extra"]["sub"]
+
+        async def events():
+            for i in range(chunks):
+                yield f"event: message\ndata: {json.dumps({'chunk': i, 'sub': sub})}\n\n"
+                await asyncio.sleep(0)
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return Starlette(routes=[Route("/mcp", stream, methods=["POST"])])
+
+
+def build_mcp_server(chunks: int) -> FastMCP:
+    """A FastMCP server with a tool that streams progress notifications before its result."""
+    mcp = FastMCP(name="Benchmark", stateless_http=True)
+
+    @mcp.tool(name="stream")
+    async def stream(ctx: Context) -> str:
+        for i in range(chunks):
+            await ctx.report_progress(i + 1, chunks)
+        return "done"
+
+    return mcp
+
+
+async def call(app: ASGIApp, body: bytes) -> tuple[float, float]:
+    """Send one POST /mcp through the ASGI app and return (ttfb, total) in seconds."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/mcp",
+        "raw_path": b"/mcp",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"benchmark"),
+            (b"authorization", f"Bearer {TOKEN}".encode()),
+            (b"content-type", b"application/json"),
+            (b"accept", b"application/json, text/event-stream"),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    request_sent = False
+    done = asyncio.Event()
+    first_byte: float | None = None
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal first_byte
+        if first_byte is None and message["type"] == "http.response.body" and message.get("body"):
+            first_byte = time.perf_counter()
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    end = time.perf_counter()
+    done.set()
+    return (first_byte or end) - start, end - start
+
+
+async def run(app: ASGIApp, body: bytes, requests: int, concurrency: int) -> tuple[float, list[tuple[float, float]]]:
+    """Send `requests` calls with `concurrency` workers and return (elapsed, [(ttfb, total), ...])."""
+    results: list[tuple[float, float]] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            results.append(await call(app, body))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, results
+
+
+def summarize(elapsed: float, results: list[tuple[float, float]]) -> dict[str, float]:
+    ttfb = sorted(r[0] for r in results)
+    total = sorted(r[1] for r in results)
+    p99 = max(int(len(results) * 0.99) - 1, 0)
+    return {
+        "rps": len(results) / elapsed,
+        "ttfb_p50": statistics.median(ttfb) * 1000,
+        "ttfb_p99": ttfb[p99] * 1000,
+        "total_p50": statistics.median(total) * 1000,
+        "total_p99": total[p99] * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=["mcp", "raw"], default="mcp",
+                        help="stream through a FastMCP tool call (mcp) or a bare StreamingResponse (raw)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--chunks", type=int, default=20, help="events streamed per response")
+    parser.add_argument("--rounds", type=int, default=3, help="alternating rounds per variant, to cancel out drift")
+    args = parser.parse_args()
+
+    # Per-request INFO logs from the MCP server would dominate the measurement
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+
+    cache = TokenCache(max_size=16, max_ttl=86400)
+    cache.set(token_digest(TOKEN), AUTH_DATA)
+
+    if args.app == "mcp":
+        mcp = build_mcp_server(args.chunks)
+        inner = mcp.streamable_http_app()
+        body = json.dumps({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": "stream", "arguments": {}, "_meta": {"progressToken": 1}},
+        }).encode()
+    else:
+        mcp = None
+        inner = build_raw_app(args.chunks)
+        body = b"{}"
+
+    pure_asgi = Auth0Middleware(inner, domain="benchmark.invalid", audience="benchmark", cache=cache)
+    variants = {
+        "pure ASGI": pure_asgi,
+        "BaseHTTPMiddleware": BaseHTTPAuth0Middleware(inner, auth=pure_asgi),
+    }
+
+    async def measure() -> dict[str, dict[str, float]]:
+        # Warm up both variants, then alternate between them so drift affects both equally
+        for app in variants.values():
+            await run(app, body, min(200, args.requests), args.concurrency)
+
+        elapsed = dict.fromkeys(variants, 0.0)
+        results: dict[str, list[tuple[float, float]]] = {name: [] for name in variants}
+        per_round = max(args.requests // args.rounds, 1)
+        for _ in range(args.rounds):
+            for name, app in variants.items():
+                round_elapsed, round_results = await run(app, body, per_round, args.concurrency)
+                elapsed[name] += round_elapsed
+                results[name].extend(round_results)
+        return {name: summarize(elapsed[name], results[name]) for name in variants}
+
+    if mcp is not None:
+        async with mcp.session_manager.run():
+            results = await measure()
+    else:
+        results = await measure()
+
+    print(f"app={args.app} requests={args.requests} concurrency={args.concurrency} chunks={args.chunks}")
+    print(f"{'variant':<20} {'req/s':>10} {'ttfb p50':>10} {'ttfb p99':>10} {'total p50':>10} {'total p99':>10}")
+    for name, r in results.items():
+        print(f"{name:<20} {r['rps']:>10.0f} {r['ttfb_p50']:>8.2f}ms {r['ttfb_p99']:>8.2f}ms "
+              f"{r['total_p50']:>8.2f}ms {r['total_p99']:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
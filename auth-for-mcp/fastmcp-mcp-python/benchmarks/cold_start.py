@@ -0,0 +1,247 @@
+"""
+Measure the MCP server's cold start and check its import-time budget.
+
+Two measurements, both against fresh Python processes:
+
+- Import profile: `python -X importtime -c "import src.server"` is compared with
+  importing only the MCP SDK and Starlette, which every MCP server pays for. The
+  remainder is the server's own import cost, including building the app at
+  module level. It must stay within `--import-budget-ms`, and modules that are
+  only needed by the first token verification (the Auth0 SDK and its crypto
+  stack) or by optional backends must not be imported at all.
+- Startup: the server module is started in a child process, the same way
+  `python -m src.server` runs it, and the time from spawning the process to the
+  first successful `tools/list` is measured, as well as the time until it accepts
+  connections. Tokens are minted by a `LocalIssuer`, so the first
+  `tools/list` includes the OIDC discovery and JWKS fetch.
+
+The process exits with status 1 when the budget is exceeded, so it can run in CI.
+
+Usage:
+    poetry run python -m benchmarks.cold_start --runs 10
+    poetry run python -m benchmarks.cold_start --import-budget-ms 40 --json cold_start.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+# Only the standard library is imported at module level: child processes run this
+# module too, and anything imported here would be missing from their measurement.
+
+AUDIENCE = "http://localhost:3001"
+SERVER_MODULE = "src.server"
+# What any FastMCP server over streamable HTTP imports, subtracted from the server's own cost
+BASELINE_IMPORT = "import mcp.server.fastmcp, starlette.applications, starlette.middleware.cors"
+# Loaded on first use: the SDK when the first token is verified, redis only by its cache backend
+DEFERRED_MODULES = ["auth0_api_python", "authlib", "cryptography", "mcp.server.auth.routes", "redis"]
+BODY = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/list", "params": {}}).encode()
+
+
+class IssuerFetch:
+    """`custom_fetch` that serves `https://{domain}` URLs from the issuer in the parent process."""
+
+    def __init__(self, domain: str, base_url: str):
+        self.domain = domain
+        self.base_url = base_url
+
+    async def __call__(self, url: str) -> Any:
+        import httpx
+
+        url = url.replace(f"https://{self.domain}", self.base_url, 1)
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url)
+        response.raise_for_status()
+        return response
+
+
+def serve(port: int, issuer_url: str) -> None:
+    """Child process: import the server module as `python -m src.server` would and serve it."""
+    import importlib
+
+    server = importlib.import_module(SERVER_MODULE)
+    # Trust the local issuer; the ApiClient is only built on first use, so this is not too late
+    server.auth0_mcp.custom_fetch = IssuerFetch(server.config.auth0_domain, issuer_url)
+
+    import uvicorn
+    uvicorn.run(server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def import_profile(statement: str, env: dict[str, str]) -> dict[str, int]:
+    """Run `statement` under `-X importtime` and return the self time of every module in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", statement],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def process_seconds(statement: str, env: dict[str, str]) -> float:
+    """Return the wall time of a Python process running `statement`."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-W", "ignore", "-c", statement], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_once(env: dict[str, str], issuer_url: str, token: str, timeout: float) -> dict[str, float]:
+    """Spawn the server and return seconds until it accepts connections and until `tools/list` succeeds."""
+    import httpx
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/mcp"
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/json, text/event-stream",
+        "Content-Type": "application/json",
+    }
+    command = [sys.executable, "-W", "ignore", "-m", "benchmarks.cold_start", "--serve", str(port), issuer_url]
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with status {process.returncode}:\n{process.stderr.read().decode()}")
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"Server did not accept connections within {timeout:g} seconds")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=timeout).close()
+                break
+            except OSError:
+                time.sleep(0.002)
+        listening = time.perf_counter() - start
+
+        # A client that was waiting for the server sends its request as soon as it connects
+        with httpx.Client(timeout=timeout) as client:
+            response = client.post(url, content=BODY, headers=headers)
+        if response.status_code != 200 or "tools" not in parse(response.text).get("result", {}):
+            raise RuntimeError(f"tools/list failed with status {response.status_code}: {response.text[:200]}")
+        return {"listening": listening, "tools_list": time.perf_counter() - start}
+    finally:
+        process.terminate()
+        process.wait()
+        process.stderr.close()
+
+
+def parse(text: str) -> dict[str, Any]:
+    """Return the JSON-RPC message from a server-sent event stream with a single event."""
+    for line in text.splitlines():
+        if line.startswith("data:"):
+            return json.loads(line[5:])
+    return {}
+
+
+def summary(durations: list[float]) -> dict[str, float]:
+    ordered = sorted(durations)
+    return {"min": ordered[0] * 1000, "median": statistics.median(ordered) * 1000, "max": ordered[-1] * 1000}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="server starts to measure")
+    parser.add_argument("--import-budget-ms", type=float, default=60.0,
+                        help="maximum import time of the server beyond the MCP SDK and Starlette")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for each start")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON, for comparing runs")
+    parser.add_argument("--serve", nargs=2, metavar=("PORT", "ISSUER_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(int(args.serve[0]), args.serve[1])
+        return 0
+
+    from .issuer import LocalIssuer
+
+    issuer = LocalIssuer().start()
+    env = {
+        **os.environ,
+        "AUTH0_DOMAIN": issuer.domain,
+        "AUTH0_AUDIENCE": AUDIENCE,
+        "MCP_SERVER_URL": AUDIENCE,
+        "DEBUG": "false",
+    }
+    try:
+        baseline = import_profile(BASELINE_IMPORT, env)
+        server = import_profile(f"import {SERVER_MODULE}", env)
+        # Split one profile, so both parts come from the same process
+        own = {name: us for name, us in server.items() if name not in baseline}
+        own_ms = sum(own.values()) / 1000
+        deferred = [name for name in DEFERRED_MODULES if name in server]
+
+        interpreter = [process_seconds("pass", env) for _ in range(args.runs)]
+        sdk = [process_seconds(BASELINE_IMPORT, env) for _ in range(args.runs)]
+        token = issuer.mint(AUDIENCE, [])
+        starts = [start_once(env, issuer.base_url, token, args.timeout) for _ in range(args.runs)]
+    finally:
+        issuer.stop()
+
+    results = {
+        "import_ms": {
+            "total": sum(server.values()) / 1000,
+            "baseline": sum(us for name, us in server.items() if name in baseline) / 1000,
+            "own": own_ms,
+            "budget": args.import_budget_ms,
+            "slowest_own": {name: us / 1000 for name, us in sorted(own.items(), key=lambda item: -item[1])[:10]},
+            "deferred_modules_imported": deferred,
+        },
+        "process_ms": {
+            "interpreter": summary(interpreter),
+            "sdk_import": summary(sdk),
+            "listening": summary([start["listening"] for start in starts]),
+            "first_tools_list": summary([start["tools_list"] for start in starts]),
+        },
+    }
+
+    imports = results["import_ms"]
+    print(f"import {SERVER_MODULE}: {imports['total']:.1f}ms total, {imports['baseline']:.1f}ms MCP SDK and Starlette, "
+          f"{own_ms:.1f}ms own (budget {args.import_budget_ms:g}ms)")
+    for name, ms in imports["slowest_own"].items():
+        print(f"  {ms:>7.2f}ms  {name}")
+    print(f"\nruns={args.runs}")
+    print(f"{'process start to':<22} {'min':>9} {'median':>9} {'max':>9}")
+    labels = {
+        "interpreter": "interpreter exit",
+        "sdk_import": "MCP SDK imported",
+        "listening": "accepting connections",
+        "first_tools_list": "first tools/list",
+    }
+    for key, label in labels.items():
+        r = results["process_ms"][key]
+        print(f"{label:<22} {r['min']:>7.1f}ms {r['median']:>7.1f}ms {r['max']:>7.1f}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+    failures = []
+    if own_ms > args.import_budget_ms:
+        failures.append(f"own import time {own_ms:.1f}ms exceeds the {args.import_budget_ms:g}ms budget")
+    if deferred:
+        failures.append(f"modules that should load on first use were imported at startup: {', '.join(deferred)}")
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+A local stand-in for an Auth0 tenant, used by the load benchmarks.
+
+It serves OIDC discovery metadata and a JWKS over HTTP and mints RS256 access
+tokens signed with its own key. `Auth0Mcp` is pointed at it through the SDK's
+`custom_fetch` hook, which rewrites `https://{domain}` to the local server, so
+tokens go through exactly the same discovery, key lookup and signature checks
+as tokens issued by a real tenant.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+
+import httpx
+import uvicorn
+from authlib.jose import JsonWebKey, jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+DOMAIN = "issuer.benchmark.invalid"
+KEY_ID = "benchmark-key"
+
+
+class LocalIssuer:
+    """
+    OIDC issuer and JWKS endpoint running on a background uvicorn thread.
+
+    Args:
+        domain: Tenant domain the issuer impersonates, used for the `iss` claim
+        host: Interface to bind the HTTP server to
+        port: Port to bind, 0 picks a free port
+    """
+
+    def __init__(self, domain: str = DOMAIN, host: str = "127.0.0.1", port: int = 0):
+        self.domain = domain
+        self.issuer = f"https://{domain}/"
+        self._key = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": KEY_ID})
+        self._server = uvicorn.Server(uvicorn.Config(self._app(), host=host, port=port, log_level="warning"))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> LocalIssuer:
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join()
+
+    async def fetch(self, url: str) -> httpx.Response:
+        """`custom_fetch` for ApiClientOptions: serve `https://{domain}` URLs from the local server."""
+        url = url.replace(f"https://{self.domain}", self.base_url, 1)
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url)
+        response.raise_for_status()
+        return response
+
+    def mint(self, audience: str, scopes: list[str], sub: str | None = None, ttl: int = 3600) -> str:
+        """Return a signed RS256 access token for the given audience and scopes."""
+        now = int(time.time())
+        claims = {
+            "iss": self.issuer,
+            "sub": sub or f"benchmark|{uuid.uuid4().hex}",
+            "aud": audience,
+            "azp": "benchmark-client",
+            "iat": now,
+            "exp": now + ttl,
+            "scope": " ".join(scopes),
+        }
+        header = {"alg": "RS256", "typ": "at+jwt", "kid": KEY_ID}
+        return jwt.encode(header, claims, self._key).decode()
+
+    def _app(self) -> Starlette:
+        async def openid_configuration(request: Request) -> JSONResponse:
+            return JSONResponse({
+                "issuer": self.issuer,
+                "jwks_uri": f"https://{self.domain}/.well-known/jwks.json",
+                "token_endpoint": f"https://{self.domain}/oauth/token",
+                "id_token_signing_alg_values_supported": ["RS256"],
+            })
+
+        async def jwks(request: Request) -> JSONResponse:
+            return JSONResponse({"keys": [self._key.as_dict(is_private=False, use="sig", alg="RS256")]})
+
+        return Starlette(routes=[
+            Route("/.well-known/openid-configuration", openid_configuration),
+            Route("/.well-known/jwks.json", jwks),
+        ])
+
@@ -0,0 +1,256 @@
+"""
+Load test the MCP server end to end, offline, against a local token issuer.
+
+The benchmark starts a `LocalIssuer` and the real server application (the same
+`create_app` composition as `src/server.py`) on local ports, mints RS256 tokens
+with the requested scopes, and drives each operation over streamable HTTP with
+a fixed number of concurrent clients. For every operation it reports client
+side p50/p95/p99 latency and throughput, plus server side timings that separate
+token signature verification from tool execution, so a regression in the auth
+path is visible on its own.
+
+Token verification only runs on token cache misses. Use `--tokens` to spread
+requests over more distinct tokens, or `--token-cache-size 0` to verify every
+request.
+
+Usage:
+    poetry run python -m benchmarks.load --requests 2000 --concurrency 32
+    poetry run python -m benchmarks.load --ops whoami greet --tokens 500 --token-cache-size 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+import uvicorn
+
+from src.app import create_app
+from src.auth0 import Auth0Mcp
+from src.config import Config
+from src.tools import register_tools
+
+from .issuer import LocalIssuer
+
+AUDIENCE = "http://localhost:3001"
+DEFAULT_SCOPES = ["tool:greet", "tool:whoami"]
+
+OPERATIONS: dict[str, dict[str, Any]] = {
+    "tools/list": {"method": "tools/list", "params": {}},
+    "whoami": {"method": "tools/call", "params": {"name": "whoami", "arguments": {}}},
+    "greet": {"method": "tools/call", "params": {"name": "greet", "arguments": {"name": "benchmark"}}},
+    "get_datetime": {"method": "tools/call", "params": {"name": "get_datetime", "arguments": {}}},
+}
+
+
+class ServerTimings:
+    """Server side durations in seconds, recorded by wrapping the verifier and the tool functions."""
+
+    def __init__(self) -> None:
+        self.verify: list[float] = []
+        self.tools: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, auth0_mcp: Auth0Mcp) -> None:
+        client = auth0_mcp.api_client
+        client.verify_access_token = self._timed(client.verify_access_token, self.verify)
+        for tool in auth0_mcp.mcp._tool_manager.list_tools():
+            tool.fn = self._timed(tool.fn, self.tools.setdefault(tool.name, []))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.verify.clear()
+            for durations in self.tools.values():
+                durations.clear()
+
+    def _timed(self, fn: Callable[..., Awaitable[Any]], durations: list[float]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(fn)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    durations.append(elapsed)
+        return timed
+
+
+class ServerThread:
+    """Run an ASGI app with uvicorn on a background thread, including its lifespan."""
+
+    def __init__(self, app: Any, port: int):
+        self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> ServerThread:
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def percentiles(durations: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99 in milliseconds using the nearest-rank method."""
+    if not durations:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(durations)
+
+    def rank(p: float) -> float:
+        return ordered[min(max(int(len(ordered) * p + 0.5) - 1, 0), len(ordered) - 1)] * 1000
+
+    return {"p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99)}
+
+
+async def call(client: httpx.AsyncClient, url: str, token: str, body: bytes) -> tuple[float, bool]:
+    """Send one JSON-RPC request and return (latency in seconds, success)."""
+    start = time.perf_counter()
+    response = await client.post(url, content=body, headers={"Authorization": f"Bearer {token}"})
+    elapsed = time.perf_counter() - start
+
+    if response.status_code != 200:
+        return elapsed, False
+    # Stateless streamable HTTP answers with a single server-sent event carrying the JSON-RPC response
+    for line in response.text.splitlines():
+        if line.startswith("data:"):
+            message = json.loads(line[5:])
+            return elapsed, "error" not in message and not message.get("result", {}).get("isError", False)
+    return elapsed, False
+
+
+async def run(
+    client: httpx.AsyncClient,
+    url: str,
+    tokens: list[str],
+    operation: str,
+    requests: int,
+    concurrency: int,
+) -> tuple[float, list[float], int]:
+    """Send `requests` calls with `concurrency` workers and return (elapsed, latencies, errors)."""
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, **OPERATIONS[operation]}).encode()
+    token_cycle = itertools.cycle(tokens)
+    remaining = iter(range(requests))
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            elapsed, ok = await call(client, url, next(token_cycle), body)
+            latencies.append(elapsed)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, errors
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", nargs="+", choices=list(OPERATIONS), default=list(OPERATIONS),
+                        help="operations to benchmark, one after another")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per operation")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured requests per operation")
+    parser.add_argument("--tokens", type=int, default=1, help="distinct access tokens to rotate through")
+    parser.add_argument("--scopes", nargs="*", default=DEFAULT_SCOPES, help="scopes granted to the minted tokens")
+    parser.add_argument("--token-cache-size", type=int, default=1024, help="0 verifies every request")
+    parser.add_argument("--token-cache-ttl", type=float, default=300.0)
+    parser.add_argument("--port", type=int, default=0, help="port for the MCP server, 0 picks a free port")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON, for comparing runs")
+    args = parser.parse_args()
+
+    issuer = LocalIssuer().start()
+    config = Config(
+        auth0_domain=issuer.domain,
+        auth0_audience=AUDIENCE,
+        mcp_server_url=AUDIENCE,
+        debug=False,
+        token_cache_size=args.token_cache_size,
+        token_cache_ttl=args.token_cache_ttl,
+    )
+    auth0_mcp = Auth0Mcp(
+        name="Benchmark FastMCP Server",
+        audience=config.auth0_audience,
+        domain=config.auth0_domain,
+        mcp_server_url=config.mcp_server_url,
+        token_cache_size=config.token_cache_size,
+        token_cache_ttl=config.token_cache_ttl,
+        custom_fetch=issuer.fetch,
+    )
+    register_tools(auth0_mcp)
+    # Per-request INFO logs from the MCP server would dominate the measurement
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    timings = ServerTimings()
+    timings.instrument(auth0_mcp)
+
+    server = ServerThread(create_app(auth0_mcp, config), args.port).start()
+    tokens = [issuer.mint(AUDIENCE, args.scopes) for _ in range(args.tokens)]
+    url = f"{server.base_url}/mcp"
+    headers = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    results: dict[str, dict[str, Any]] = {}
+    try:
+        async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30.0) as client:
+            for operation in args.ops:
+                if args.warmup:
+                    await run(client, url, tokens, operation, args.warmup, args.concurrency)
+                if auth0_mcp.token_cache is not None:
+                    # Start every operation from a cold cache so each one pays the same verification cost
+                    auth0_mcp.token_cache.clear()
+                timings.reset()
+
+                elapsed, latencies, errors = await run(client, url, tokens, operation, args.requests, args.concurrency)
+                tool = OPERATIONS[operation]["params"].get("name")
+                results[operation] = {
+                    "requests": len(latencies),
+                    "errors": errors,
+                    "rps": len(latencies) / elapsed,
+                    "latency_ms": percentiles(latencies),
+                    "verifications": len(timings.verify),
+                    "verify_ms": percentiles(timings.verify),
+                    "tool_ms": percentiles(timings.tools[tool]) if tool else None,
+                }
+    finally:
+        server.stop()
+        issuer.stop()
+
+    print(f"requests={args.requests} concurrency={args.concurrency} tokens={args.tokens} "
+          f"token_cache_size={args.token_cache_size}")
+    print(f"{'operation':<14} {'req/s':>8} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9} "
+          f"{'verifies':>9} {'verify p50':>11} {'verify p99':>11} {'tool p50':>9} {'tool p99':>9}")
+    for operation, r in results.items():
+        latency, verify, tool = r["latency_ms"], r["verify_ms"], r["tool_ms"]
+        tool_columns = f"{tool['p50']:>7.3f}ms {tool['p99']:>7.3f}ms" if tool else f"{'-':>9} {'-':>9}"
+        print(f"{operation:<14} {r['rps']:>8.0f} {r['errors']:>7} {latency['p50']:>7.2f}ms {latency['p95']:>7.2f}ms "
+              f"{latency['p99']:>7.2f}ms {r['verifications']:>9} {verify['p50']:>9.3f}ms {verify['p99']:>9.3f}ms "
+              f"{tool_columns}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
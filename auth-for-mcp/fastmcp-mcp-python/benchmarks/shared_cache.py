@@ -0,0 +1,237 @@
+"""
+Compare token verification work per request across uvicorn worker counts.
+
+The benchmark starts a `LocalIssuer`, then serves the real server application
+from N worker processes sharing one port (SO_REUSEPORT, like `uvicorn --workers`)
+and sends `whoami` tool calls over fresh connections, so consecutive requests
+with the same token land on different workers. Each worker counts its calls to
+`verify_access_token` and its CPU time, and the benchmark reports verifications,
+verification time and server CPU time per request for every worker count and
+token cache backend.
+
+With the `memory` backend every worker verifies each token once, so verification
+work grows with the worker count. With the `redis` backend a token verified by
+one worker is served to the others from the shared cache. The `redis` runs need
+the `redis` extra (`poetry install --extras redis`) and a Redis-protocol server
+at `--redis-url`.
+
+Usage:
+    poetry run python -m benchmarks.shared_cache --workers 1 2 4 --backends memory
+    poetry run python -m benchmarks.shared_cache --workers 1 2 4 --redis-url redis://localhost:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import logging
+import multiprocessing
+import socket
+import time
+from typing import Any
+
+import httpx
+
+from .issuer import LocalIssuer
+
+AUDIENCE = "http://localhost:3001"
+BODY = json.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "tools/call",
+    "params": {"name": "whoami", "arguments": {}},
+}).encode()
+
+
+class RemoteFetch:
+    """Picklable `custom_fetch` that serves `https://{domain}` URLs from the issuer in the parent process."""
+
+    def __init__(self, domain: str, base_url: str):
+        self.domain = domain
+        self.base_url = base_url
+
+    async def __call__(self, url: str) -> httpx.Response:
+        url = url.replace(f"https://{self.domain}", self.base_url, 1)
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url)
+        response.raise_for_status()
+        return response
+
+
+def serve(port: int, fetch: RemoteFetch, backend: str, redis_url: str, control: Any) -> None:
+    """Worker process: serve the app on a shared port and answer snapshot requests until stopped."""
+    import uvicorn
+
+    from src.app import create_app
+    from src.auth0 import Auth0Mcp
+    from src.config import Config
+    from src.tools import register_tools
+
+    logging.disable(logging.WARNING)
+    config = Config(auth0_domain=fetch.domain, auth0_audience=AUDIENCE, mcp_server_url=AUDIENCE, debug=False)
+    auth0_mcp = Auth0Mcp(
+        name="Benchmark FastMCP Server",
+        audience=config.auth0_audience,
+        domain=config.auth0_domain,
+        mcp_server_url=config.mcp_server_url,
+        token_cache_backend=backend,
+        token_cache_url=redis_url,
+        custom_fetch=fetch,
+    )
+    register_tools(auth0_mcp)
+
+    verifications = {"count": 0, "seconds": 0.0}
+    verify = auth0_mcp.api_client.verify_access_token
+
+    @functools.wraps(verify)
+    async def counted_verify(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await verify(*args, **kwargs)
+        finally:
+            verifications["count"] += 1
+            verifications["seconds"] += time.perf_counter() - start
+
+    auth0_mcp.api_client.verify_access_token = counted_verify
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(("127.0.0.1", port))
+    server = uvicorn.Server(uvicorn.Config(create_app(auth0_mcp, config), log_level="warning", access_log=False))
+
+    async def main() -> None:
+        task = asyncio.create_task(server.serve(sockets=[sock]))
+        while not server.started:
+            await asyncio.sleep(0.01)
+        control.send("ready")
+        while True:
+            if control.poll():
+                if control.recv() == "stop":
+                    break
+                control.send({"cpu": time.process_time(), **verifications})
+            await asyncio.sleep(0.01)
+        server.should_exit = True
+        await task
+
+    asyncio.run(main())
+
+
+async def drive(url: str, tokens: list[str], requests: int, concurrency: int) -> int:
+    """Send whoami calls over fresh connections and return the number of failed calls."""
+    token_cycle = itertools.cycle(tokens)
+    remaining = iter(range(requests))
+    errors = 0
+    # No keep-alive, so every request may be accepted by a different worker
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=0)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker() -> None:
+            nonlocal errors
+            for _ in remaining:
+                response = await client.post(url, content=BODY, headers={
+                    "Authorization": f"Bearer {next(token_cycle)}",
+                    "Accept": "application/json, text/event-stream",
+                    "Content-Type": "application/json",
+                })
+                errors += response.status_code != 200
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return errors
+
+
+def snapshot(controls: list[Any]) -> list[dict[str, float]]:
+    for control in controls:
+        control.send("snapshot")
+    return [control.recv() for control in controls]
+
+
+def run(args: argparse.Namespace, issuer: LocalIssuer, workers: int, backend: str) -> dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    fetch = RemoteFetch(issuer.domain, issuer.base_url)
+    tokens = [issuer.mint(AUDIENCE, ["tool:whoami"]) for _ in range(args.tokens)]
+
+    processes, controls = [], []
+    for _ in range(workers):
+        parent, child = ctx.Pipe()
+        process = ctx.Process(target=serve, args=(port, fetch, backend, args.redis_url, child), daemon=True)
+        process.start()
+        processes.append(process)
+        controls.append(parent)
+
+    try:
+        for process, control in zip(processes, controls):
+            if not control.poll(60) or control.recv() != "ready":
+                raise RuntimeError(f"Worker {process.pid} did not start")
+
+        url = f"http://127.0.0.1:{port}/mcp"
+        before = snapshot(controls)
+        start = time.perf_counter()
+        errors = asyncio.run(drive(url, tokens, args.requests, args.concurrency))
+        elapsed = time.perf_counter() - start
+        after = snapshot(controls)
+    finally:
+        for control in controls:
+            control.send("stop")
+        for process in processes:
+            process.join(10)
+            if process.is_alive():
+                process.terminate()
+
+    def delta(key: str) -> float:
+        return sum(a[key] - b[key] for a, b in zip(after, before))
+
+    return {
+        "workers": workers,
+        "backend": backend,
+        "requests": args.requests,
+        "errors": errors,
+        "rps": round(args.requests / elapsed, 1),
+        "verifications": int(delta("count")),
+        "verifications_per_request": round(delta("count") / args.requests, 3),
+        "verify_ms_per_request": round(delta("seconds") / args.requests * 1000, 3),
+        "cpu_ms_per_request": round(delta("cpu") / args.requests * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker process counts to measure")
+    parser.add_argument("--backends", nargs="+", choices=["memory", "redis"], default=["memory", "redis"])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0", help="server used by the redis backend")
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per run")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--tokens", type=int, default=50, help="distinct access tokens to rotate through")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON, for comparing runs")
+    args = parser.parse_args()
+
+    issuer = LocalIssuer().start()
+    results = []
+    try:
+        print(f"{'workers':>7} {'backend':>7} {'errors':>6} {'rps':>7} {'verifies':>8} "
+              f"{'verifies/req':>12} {'verify ms/req':>13} {'cpu ms/req':>10}")
+        for workers in args.workers:
+            for backend in args.backends:
+                result = run(args, issuer, workers, backend)
+                results.append(result)
+                print(
+                    f"{workers:>7} {backend:>7} {result['errors']:>6} {result['rps']:>7.1f} "
+                    f"{result['verifications']:>8} {result['verifications_per_request']:>12.3f} "
+                    f"{result['verify_ms_per_request']:>13.3f} {result['cpu_ms_per_request']:>10.3f}"
+                )
+    finally:
+        issuer.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
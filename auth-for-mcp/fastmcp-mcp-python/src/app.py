@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import contextlib
+from collections.abc import AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount
+from starlette.types import ASGIApp
+
+from .auth0 import Auth0Mcp
+from .auth0.shared_cache import RedisTokenCache
+from .config import Config
+
+
+def create_app(auth0_mcp: Auth0Mcp, config: Config) -> ASGIApp:
+    """
+    Build the ASGI application serving the MCP server and its discovery metadata.
+    """
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with contextlib.AsyncExitStack() as stack:
+            # Prefetch signing keys in the background and keep them fresh so steady-state verification never waits on a key fetch
+            await stack.enter_async_context(auth0_mcp.jwks.run())
+            if auth0_mcp.issuers is not None:
+                await stack.enter_async_context(auth0_mcp.issuers.run())
+            await stack.enter_async_context(auth0_mcp.mcp.session_manager.run())
+            if isinstance(auth0_mcp.token_cache, RedisTokenCache):
+                stack.push_async_callback(auth0_mcp.token_cache.aclose)
+            yield
+
+    starlette_app = Starlette(
+        debug=config.debug,
+        routes=[
+            # Add discovery metadata route
+            *auth0_mcp.auth_metadata_router().routes,
+
+            # Prometheus metrics for the auth and tool pipeline
+            *(auth0_mcp.metrics_router().routes if config.metrics_enabled else []),
+
+            # Main MCP app route with authentication middleware
+            Mount(
+                "/",
+                app=auth0_mcp.mcp.streamable_http_app(),
+                middleware=auth0_mcp.auth_middleware()
+            ),
+        ],
+        lifespan=lifespan,
+        exception_handlers=auth0_mcp.exception_handlers(),
+    )
+
+    # Wrap ASGI application with CORS middleware to expose Mcp-Session-Id header
+    # for browser-based clients (ensures 500 errors get proper CORS headers)
+    return CORSMiddleware(
+        starlette_app,
+        allow_origins=config.cors_origins,
+        allow_methods=["GET", "POST", "DELETE"], # MCP streamable HTTP methods
+        expose_headers=["Mcp-Session-Id"],
+    )
@@ -7,23 +7,55 @@ including token verification, middleware, and scoped tool decorators.
 
 from __future__ import annotations
 
+import functools
 import logging
-from collections.abc import Callable
+import math
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
 
-from mcp.server.auth.routes import create_protected_resource_routes
-from mcp.server.fastmcp import FastMCP
+from mcp.shared.auth import ProtectedResourceMetadata
+from pydantic import AnyHttpUrl
 from starlette.middleware import Middleware
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 from starlette.routing import Route, Router
 
-from .errors import AuthenticationRequired, InsufficientScope, MalformedAuthorizationRequest
+from .cache import RejectionCache, TokenCache, TokenStore
+from .errors import (
+    AuthenticationRequired,
+    InsufficientScope,
+    MalformedAuthorizationRequest,
+    SessionNotFound,
+    TooManyRequests,
+)
+from .issuers import IssuerRegistry, Verifier
+from .jwks import JwksManager
+from .metadata import StaticDocument, resource_metadata_path
+from .metrics import Auth0Metrics
 from .middleware import Auth0Middleware
+from .ratelimit import RateLimiter
+from .results import ToolResultCache
+from .server import Auth0FastMCP
+from .sessions import SessionStore
+from .shared_cache import RedisTokenCache
+from .timing import ServerTimingMiddleware
+
+if TYPE_CHECKING:
+    from auth0_api_python import ApiClient
 
 logger = logging.getLogger(__name__)
 
 
+def _token_cache(backend: str, size: int, ttl: float, url: str) -> TokenStore | None:
+    if size <= 0:
+        return None
+    if backend == "memory":
+        return TokenCache(size, ttl)
+    if backend == "redis":
+        return RedisTokenCache(url, max_size=size, max_ttl=ttl)
+    raise ValueError(f"Unknown token cache backend '{backend}', expected 'memory' or 'redis'")
+
+
 class Auth0Mcp:
     """
     Auth0 integration for FastMCP servers.
@@ -35,50 +67,176 @@ class Auth0Mcp:
         name: Human-readable name for the MCP server
         audience: Auth0 API identifier (OAuth2 audience claim)
         domain: Auth0 tenant domain (e.g., 'tenant.us.auth0.com')
+        mcp_server_url: Base URL of the MCP server (optional)
+        token_cache_size: Maximum number of verified tokens to cache (0 disables the cache)
+        token_cache_ttl: Maximum number of seconds a verified token is cached
+        token_cache_backend: "memory" for a per-process cache, or "redis" to share verified tokens between worker processes
+        token_cache_url: Redis-protocol server URL used by the "redis" backend
+        jwks_refresh_interval: Seconds between background refreshes of the signing keys
+        issuer_domains: Other Auth0 tenant domains whose tokens are accepted, selected by the token's `iss`
+        issuer_cache_size: Maximum number of verifiers kept for the other tenants
+        metadata_max_age: Seconds clients may cache the Protected Resource Metadata (0 makes them revalidate)
+        server_timing: Send a Server-Timing header with the auth and tool spans of each MCP request
+        server_timing_log: Also log the spans of each MCP request as one structured line
+        rejection_cache_size: Maximum number of rejected tokens to remember (0 disables the cache)
+        rejection_cache_ttl: Number of seconds a rejected token is remembered
+        rejection_rate: Rejected tokens per second allowed per remote address (0 disables the limit)
+        rejection_burst: Number of rejected tokens a remote address may accumulate before getting 429s
+        client_rejection_rate: Rejected tokens per second allowed per client ID at one remote address (0 disables the limit)
+        client_rejection_burst: Number of rejected tokens a client ID may accumulate at one remote address before getting 429s
+        tool_result_cache_size: Maximum number of read-only tool results to cache (0 disables the cache)
+        tool_result_cache_ttl: Default number of seconds a cached tool result is fresh
+        tool_result_cache_stale_ttl: Seconds a stale tool result is served while it is refreshed
+        stateless_http: Authenticate every request on its own (True), or keep MCP sessions and bind each
+            session to the auth data of the request that opened it (False)
+        session_cache_size: Maximum number of session bindings kept in stateful mode (0 verifies every request)
+        session_idle_ttl: Seconds without requests after which a session's binding is dropped
+        custom_fetch: Optional async callable used instead of httpx to fetch OIDC metadata and JWKS
 
     Raises:
         RuntimeError: If audience or domain are not provided
+        ValueError: If token_cache_backend is not "memory" or "redis"
     """
-    def __init__(self, name: str, audience: str, domain: str, mcp_server_url: str | None = None):
+    def __init__(
+        self,
+        name: str,
+        audience: str,
+        domain: str,
+        mcp_server_url: str | None = None,
+        token_cache_size: int = 1024,
+        token_cache_ttl: float = 300.0,
+        token_cache_backend: str = "memory",
+        token_cache_url: str = "redis://localhost:6379/0",
+        jwks_refresh_interval: float = 600.0,
+        issuer_domains: list[str] | None = None,
+        issuer_cache_size: int = 16,
+        metadata_max_age: int = 0,
+        server_timing: bool = False,
+        server_timing_log: bool = False,
+        rejection_cache_size: int = 1024,
+        rejection_cache_ttl: float = 30.0,
+        rejection_rate: float = 1.0,
+        rejection_burst: int = 20,
+        client_rejection_rate: float = 0.2,
+        client_rejection_burst: int = 5,
+        tool_result_cache_size: int = 0,
+        tool_result_cache_ttl: float = 30.0,
+        tool_result_cache_stale_ttl: float = 30.0,
+        stateless_http: bool = True,
+        session_cache_size: int = 1024,
+        session_idle_ttl: float = 1800.0,
+        custom_fetch: Callable[[str], Awaitable[Any]] | None = None,
+    ):
         self.name = name
         self.audience = audience
         self.domain = domain
         self.mcp_server_url = mcp_server_url
         if not self.audience or not self.domain:
             raise RuntimeError("audience and domain must be provided")
-        self.mcp = FastMCP(
+        # Serve these from `metrics_router()`
+        self.metrics = Auth0Metrics()
+        self.token_cache = _token_cache(token_cache_backend, token_cache_size, token_cache_ttl, token_cache_url)
+        self.custom_fetch = custom_fetch
+        self.rejection_cache = RejectionCache(rejection_cache_size, rejection_cache_ttl) if rejection_cache_size > 0 else None
+        self.rejection_limiter = RateLimiter(rejection_rate, rejection_burst) if rejection_rate > 0 else None
+        self.client_rejection_limiter = (
+            RateLimiter(client_rejection_rate, client_rejection_burst) if client_rejection_rate > 0 else None
+        )
+        # Run `jwks.run()` from the server lifespan to prefetch and rotate signing keys
+        self.jwks = JwksManager(lambda: self.api_client, refresh_interval=jwks_refresh_interval)
+        # Run `issuers.run()` from the server lifespan to refresh the other tenants' signing keys
+        self.issuers = IssuerRegistry(
+            Verifier(self.domain, lambda: self.api_client, self.jwks),
+            issuer_domains,
+            audience=self.audience,
+            max_size=issuer_cache_size,
+            refresh_interval=jwks_refresh_interval,
+            custom_fetch=custom_fetch,
+            metrics=self.metrics,
+        ) if issuer_domains else None
+        self.tool_result_cache = ToolResultCache(
+            tool_result_cache_size, tool_result_cache_ttl, tool_result_cache_stale_ttl
+        ) if tool_result_cache_size > 0 else None
+        # Stateful mode only re-verifies a session's token when it changes
+        self.sessions = SessionStore(session_cache_size, session_idle_ttl) if not stateless_http and session_cache_size > 0 else None
+        self.mcp = Auth0FastMCP(
             name=self.name,
-            stateless_http=True,
+            stateless_http=stateless_http,
+            result_cache=self.tool_result_cache,
+            metrics=self.metrics,
         )
         self._scopes_supported = {
             "openid",
             "profile",
             "email"
         }
+        self._metadata_document = StaticDocument(self._render_metadata, max_age=metadata_max_age)
+        self.server_timing = server_timing
+        self.server_timing_log = server_timing_log
+
+    @functools.cached_property
+    def api_client(self) -> ApiClient:
+        """
+        The Auth0 SDK client, built on first use.
+
+        Importing the SDK loads authlib and cryptography, so it is kept off the
+        import path and happens when the lifespan prefetches the signing keys.
+        """
+        from auth0_api_python import ApiClient, ApiClientOptions
+
+        return ApiClient(ApiClientOptions(
+            domain=self.domain,
+            audience=self.audience,
+            custom_fetch=self.custom_fetch
+        ))
 
     def auth_metadata_router(self) -> Router:
         """
         Returns a router that serves the OAuth Protected Resource Metadata
         at the standard endpoint: /.well-known/oauth-protected-resource
+
+        The document is rendered once and served with a strong ETag. Conditional
+        requests get a 304, and registering scopes renders it again.
         """
-        routes: list[Route] = create_protected_resource_routes(
-            resource_url=self.audience,
-            authorization_servers=[f"https://{self.domain}"],
-            scopes_supported=list(self._scopes_supported),
+        return Router(routes=[Route(resource_metadata_path(self.audience), endpoint=self._metadata_document, methods=["GET", "HEAD"])])
+
+    def _render_metadata(self) -> bytes:
+        metadata = ProtectedResourceMetadata(
+            resource=AnyHttpUrl(self.audience),
+            authorization_servers=[
+                AnyHttpUrl(f"https://{domain}")
+                for domain in (self.issuers.domains if self.issuers is not None else [self.domain])
+            ],
+            # Sorted so every replica serves the same bytes and therefore the same ETag
+            scopes_supported=sorted(self._scopes_supported),
             resource_name=self.name,
         )
+        return metadata.model_dump_json(exclude_none=True).encode("utf-8")
 
-        # Middleware to override cache headers
-        class NoCacheMiddleware(BaseHTTPMiddleware):
-            async def dispatch(self, request: Request, call_next: Callable) -> Response:
-                response = await call_next(request)
-                response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-                return response
-
-        return Router(routes=routes, middleware=[Middleware(NoCacheMiddleware)])
+    def metrics_router(self) -> Router:
+        """
+        Returns a router that serves the auth and tool pipeline metrics
+        in the Prometheus text format at /metrics
+        """
+        return Router(routes=[Route("/metrics", endpoint=self.metrics.endpoint, methods=["GET"], name="metrics")])
 
     def auth_middleware(self) -> list[Middleware]:
-        return [Middleware(Auth0Middleware, domain=self.domain, audience=self.audience)]
+        # Outermost, so the spans cover header parsing and token verification too
+        timing = [Middleware(ServerTimingMiddleware, log=self.server_timing_log)] if self.server_timing else []
+        return [*timing, Middleware(
+            Auth0Middleware,
+            domain=self.domain,
+            audience=self.audience,
+            cache=self.token_cache,
+            get_client=lambda: self.api_client,
+            jwks=self.jwks,
+            issuers=self.issuers,
+            rejections=self.rejection_cache,
+            limiter=self.rejection_limiter,
+            client_limiter=self.client_rejection_limiter,
+            sessions=self.sessions,
+            metrics=self.metrics
+        )]
 
     def register_scopes(self, scopes: list[str]) -> None:
         """
@@ -89,12 +247,15 @@ class Auth0Mcp:
         """
         if scopes:
             self._scopes_supported.update(scopes)
+            self._metadata_document.invalidate()
 
     def exception_handlers(self) -> dict[int | type[Exception], Callable[[Request, Exception], Response]]:
         return {
             AuthenticationRequired: self._auth_error_handler,
             InsufficientScope: self._auth_error_handler,
             MalformedAuthorizationRequest: self._auth_error_handler,
+            TooManyRequests: self._rate_limit_handler,
+            SessionNotFound: self._session_error_handler,
             # Generic fallback for any other exceptions
             Exception: self._generic_exception_handler,
         }
@@ -103,6 +264,8 @@ class Auth0Mcp:
         """
         Handle auth errors: malformed authorization requests, missing auth, invalid tokens, and insufficient scopes.
         """
+        self.metrics.auth_rejections.inc(error_code=exc.error_code)
+
         # Include resource metadata parameter for 401 responses per RFC 9728 Section 5.1
         include_resource_metadata = exc.status_code == 401
 
@@ -115,6 +278,33 @@ class Auth0Mcp:
             headers={"WWW-Authenticate": self._build_www_authenticate_header(exc.error_code, exc.description, include_resource_metadata)},
         )
 
+    def _rate_limit_handler(self, request: Request, exc: TooManyRequests) -> JSONResponse:
+        """
+        Handle requests refused by the rejected-token rate limiter.
+        """
+        self.metrics.auth_rejections.inc(error_code=exc.error_code)
+        return JSONResponse(
+            {
+                "error": exc.error_code,
+                "error_description": exc.description
+            },
+            status_code=exc.status_code,
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        )
+
+    def _session_error_handler(self, request: Request, exc: SessionNotFound) -> JSONResponse:
+        """
+        Handle requests for a session that is bound to another user.
+        """
+        self.metrics.auth_rejections.inc(error_code=exc.error_code)
+        return JSONResponse(
+            {
+                "error": exc.error_code,
+                "error_description": exc.description
+            },
+            status_code=exc.status_code,
+        )
+
     def _generic_exception_handler(self, request: Request, exc: Exception) -> JSONResponse:
         """
         Fallback handler for all other exceptions.
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import inspect
 from collections.abc import Iterable
 from functools import wraps
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from mcp.server.fastmcp import Context
+from mcp.server.lowlevel.server import request_ctx
 
-from . import Auth0Mcp
 from .errors import AuthenticationRequired, InsufficientScope
 
+if TYPE_CHECKING:
+    from . import Auth0Mcp
+
+F = TypeVar("F")
+
+# Attribute holding the scopes a tool function requires, read by Auth0FastMCP when the tool is added
+REQUIRED_SCOPES_ATTR = "__auth0_required_scopes__"
+# Attribute of a @require_scopes wrapper holding the function it wraps, registered by Auth0FastMCP instead
+UNCHECKED_ATTR = "__auth0_unchecked__"
+
 # Collect required scopes from all decorated functions
 _scopes_required: set[str] = set()
 
@@ -15,38 +26,57 @@ def require_scopes(required_scopes: Iterable[str]):
     """
     Decorator that requires scopes on MCP tools.
 
+    The scopes are recorded on the tool and compiled into the server's per-tool
+    requirement table when it is registered on `Auth0Mcp.mcp` (an
+    `Auth0FastMCP`), which checks them before arguments are validated and runs
+    the undecorated function. Registered on any other server, the wrapper
+    checks them on every call instead, so the requirement is never dropped.
+
     Example:
       @mcp.tool(...)
       @require_scopes(["tool:greet", "tool:whoami"])
       async def my_tool(name: str, ctx: Context) -> str:
         return f"Hello {name}!"
     """
-    required_scopes_list = list(required_scopes)
+    scopes = frozenset(required_scopes)
 
     # Collect scopes when decorator is applied
-    _scopes_required.update(required_scopes_list)
-
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # ctx is passed in either kw or positional
-            ctx: Context | None = (kwargs.get("ctx") if isinstance(kwargs.get("ctx"), Context) else None) or next((arg for arg in args if isinstance(arg, Context)), None)
-            if ctx is None:
-                raise TypeError("ctx: Context is required")
-
-            auth = getattr(ctx.request_context.request.state, "auth", {})
-            if not auth:
-                raise AuthenticationRequired("Authentication required")
-
-            user_scopes = set(auth.get("scopes", []))
-            missing_scopes = [s for s in required_scopes_list if s not in user_scopes]
-            if missing_scopes:
-                raise InsufficientScope(f"Missing required scopes: {missing_scopes}")
-
-            return await func(*args, **kwargs)
-        return wrapper
+    _scopes_required.update(scopes)
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                check_scopes(_request_auth(), scopes)
+                return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                check_scopes(_request_auth(), scopes)
+                return func(*args, **kwargs)
+
+        setattr(wrapper, REQUIRED_SCOPES_ATTR, scopes)
+        setattr(wrapper, UNCHECKED_ATTR, func)
+        return wrapper  # type: ignore[return-value]
     return decorator
 
+def check_scopes(auth: dict[str, Any] | None, required: frozenset[str]) -> None:
+    """Raise unless the auth data of the request grants every required scope."""
+    if not auth:
+        raise AuthenticationRequired("Authentication required")
+
+    if not required <= auth["scope_set"]:
+        missing_scopes = sorted(required - auth["scope_set"])
+        raise InsufficientScope(f"Missing required scopes: {missing_scopes}")
+
+def _request_auth() -> dict[str, Any] | None:
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        # Called outside of an MCP request
+        return None
+    return getattr(request.state, "auth", None) if request is not None else None
+
 def register_required_scopes(auth0_mcp: Auth0Mcp) -> None:
     """Register all scopes that were collected from @require_scopes decorators."""
     if _scopes_required:
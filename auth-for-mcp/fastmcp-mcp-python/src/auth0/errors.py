@@ -48,3 +48,58 @@ class MalformedAuthorizationRequest(Exception):
     def __init__(self, message: str | None = None):
         self.description = message or self.default_description
         super().__init__(self.description)
+
+
+class TooManyRequests(Exception):
+    """
+    Raised when a client has had too many tokens rejected recently.
+
+    This maps to HTTP 429 Too Many Requests status.
+    Indicates the request was refused before token verification and may
+    be retried after `retry_after` seconds.
+    """
+    status_code = 429
+    error_code = "too_many_requests"
+    default_description = "Too many rejected tokens, retry later"
+
+    def __init__(self, message: str | None = None, retry_after: float = 1.0):
+        self.description = message or self.default_description
+        self.retry_after = retry_after
+        super().__init__(self.description)
+
+
+class ServiceUnavailable(Exception):
+    """
+    Raised when a tool call is shed by its bulkhead.
+
+    Unlike the errors above, this is raised inside the tool call, after the
+    HTTP request was accepted. The client receives it as a tool result with
+    `isError` set and the description as its text, in a 200 response, not as
+    an HTTP 503. Indicates the tool is at its concurrency and queue limits, or
+    the call ran past its timeout, and may be retried after `retry_after`
+    seconds.
+    """
+    error_code = "temporarily_unavailable"
+    default_description = "Service temporarily unavailable, retry later"
+
+    def __init__(self, message: str | None = None, retry_after: float = 1.0):
+        self.description = message or self.default_description
+        self.retry_after = retry_after
+        super().__init__(self.description)
+
+
+class SessionNotFound(Exception):
+    """
+    Raised when a request presents a session bound to another user.
+
+    This maps to HTTP 404 Not Found status, the response MCP clients get
+    for unknown sessions, so they start a new session instead of learning
+    that the session exists.
+    """
+    status_code = 404
+    error_code = "invalid_request"
+    default_description = "Session not found"
+
+    def __init__(self, message: str | None = None):
+        self.description = message or self.default_description
+        super().__init__(self.description)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .jwks import JwksManager
+from .metrics import Auth0Metrics
+
+if TYPE_CHECKING:
+    from auth0_api_python import ApiClient
+
+logger = logging.getLogger(__name__)
+
+
+def lazy_api_client(**options: Any) -> Callable[[], ApiClient]:
+    """
+    Return a function that builds an ApiClient with `options` on its first call and returns it afterwards.
+
+    The Auth0 SDK loads authlib and cryptography, so it is imported by that first call.
+    """
+    @functools.cache
+    def get_client() -> ApiClient:
+        from auth0_api_python import ApiClient, ApiClientOptions
+
+        return ApiClient(ApiClientOptions(**options))
+    return get_client
+
+
+def issuer_for(domain: str) -> str:
+    """Return the `iss` claim of access tokens issued by an Auth0 tenant domain."""
+    return f"https://{domain}/"
+
+
+@dataclass
+class Verifier:
+    """The ApiClient and signing keys that verify the tokens of one Auth0 tenant."""
+
+    domain: str
+    get_client: Callable[[], ApiClient]
+    jwks: JwksManager
+
+    @property
+    def client(self) -> ApiClient:
+        return self.get_client()
+
+
+class IssuerRegistry:
+    """
+    Token verifiers for the Auth0 tenants a server trusts, selected by the token's `iss` claim.
+
+    The primary tenant's verifier is created with the server and always kept. A
+    verifier for any other trusted tenant, with its own ApiClient and JWKS, is
+    created when the first token from that tenant arrives, and the least recently
+    used ones are dropped once more than `max_size` are kept. A dropped verifier is
+    created again on demand, which fetches the tenant's OIDC metadata and keys again.
+    While `run()` is active, the signing keys of the kept verifiers are refreshed on
+    `refresh_interval`, like the primary tenant's.
+
+    Args:
+        primary: Verifier of the tenant the server is configured with
+        domains: Other tenant domains whose tokens are accepted
+        audience: API identifier the tokens must be issued for
+        max_size: Maximum number of verifiers kept for the other tenants
+        refresh_interval: Seconds between background refreshes of each verifier's signing keys
+        custom_fetch: Optional async callable used instead of httpx to fetch OIDC metadata and JWKS
+        metrics: Optional metrics counting created and evicted verifiers
+
+    Raises:
+        ValueError: If max_size is not positive
+    """
+
+    def __init__(
+        self,
+        primary: Verifier,
+        domains: list[str],
+        audience: str,
+        max_size: int = 16,
+        refresh_interval: float = 600.0,
+        custom_fetch: Callable[[str], Awaitable[Any]] | None = None,
+        metrics: Auth0Metrics | None = None,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.primary = primary
+        self.audience = audience
+        self.max_size = max_size
+        self.refresh_interval = refresh_interval
+        self.custom_fetch = custom_fetch
+        self.metrics = metrics
+        self._domains = {issuer_for(domain): domain for domain in domains if domain != primary.domain}
+        self._verifiers: OrderedDict[str, Verifier] = OrderedDict()
+
+    @property
+    def domains(self) -> list[str]:
+        """All trusted tenant domains, the primary one first."""
+        return [self.primary.domain, *self._domains.values()]
+
+    def get(self, issuer: str | None) -> Verifier | None:
+        """Return the verifier for a token's `iss`, creating it if needed, or None if the issuer is not trusted."""
+        if not isinstance(issuer, str):
+            return None
+        if issuer == issuer_for(self.primary.domain):
+            return self.primary
+
+        verifier = self._verifiers.get(issuer)
+        if verifier is not None:
+            self._verifiers.move_to_end(issuer)
+            return verifier
+
+        domain = self._domains.get(issuer)
+        if domain is None:
+            return None
+        verifier = self._create(domain)
+        self._verifiers[issuer] = verifier
+        if len(self._verifiers) > self.max_size:
+            evicted_issuer, _ = self._verifiers.popitem(last=False)
+            logger.info(f"Dropped the verifier for {evicted_issuer}, more than {self.max_size} issuers are in use")
+            self._count("evicted")
+        return verifier
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of kept verifiers for the other tenants and of trusted tenants."""
+        return {"size": len(self._verifiers), "trusted": len(self._domains) + 1}
+
+    @contextlib.asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        """Keep refreshing the signing keys of the kept verifiers while the context is open."""
+        task = asyncio.create_task(self._refresh_loop())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            for issuer, verifier in list(self._verifiers.items()):
+                try:
+                    await verifier.jwks.refresh()
+                except Exception:
+                    # Keep serving with the previous key set
+                    logger.warning(f"Background JWKS refresh failed for {issuer}", exc_info=True)
+
+    def _create(self, domain: str) -> Verifier:
+        get_client = lazy_api_client(domain=domain, audience=self.audience, custom_fetch=self.custom_fetch)
+        logger.info(f"Created a verifier for tokens issued by {domain}")
+        self._count("created")
+        # Background refreshes come from `run()`, not from the verifier's own JwksManager
+        return Verifier(domain, get_client, JwksManager(get_client, refresh_interval=self.refresh_interval))
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            self.metrics.issuer_verifiers.inc(event=event)
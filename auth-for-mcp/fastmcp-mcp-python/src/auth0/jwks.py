@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from auth0_api_python import ApiClient
+
+logger = logging.getLogger(__name__)
+
+
+class JwksManager:
+    """
+    Keeps the signing keys of an ApiClient warm.
+
+    The Auth0 SDK fetches OIDC metadata and the JWKS lazily inside the first
+    `verify_access_token` call and never refreshes them afterwards. This manager
+    prefetches both in the background when the server starts, refreshes the key
+    set on an interval, and refreshes it on demand when a token carries
+    an unknown `kid`. Concurrent refreshes are de-duplicated into a single fetch.
+
+    The ApiClient is only requested when keys are first needed, so the SDK is
+    imported by the prefetch rather than when the server module is imported.
+
+    Args:
+        get_client: Returns the ApiClient whose key set is managed
+        refresh_interval: Seconds between background refreshes
+        min_refresh_interval: Minimum seconds between refreshes triggered by unknown `kid` values
+    """
+
+    def __init__(self, get_client: Callable[[], ApiClient], refresh_interval: float = 600.0, min_refresh_interval: float = 30.0):
+        self.get_client = get_client
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._kids: frozenset[str] = frozenset()
+        self._last_refresh = 0.0
+        self._inflight: asyncio.Task[None] | None = None
+
+    @property
+    def client(self) -> ApiClient:
+        return self.get_client()
+
+    def has_key(self, kid: str) -> bool:
+        return kid in self._kids
+
+    async def refresh(self) -> None:
+        """Fetch the key set, joining an in-flight fetch instead of starting a second one."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+        # Shield the shared fetch so a cancelled waiter does not cancel it for everyone else
+        await asyncio.shield(self._inflight)
+
+    async def ensure_key(self, token: str) -> None:
+        """
+        Make sure the key for the token's `kid` is loaded before verification.
+
+        This is a no-op in steady state. It only waits on a fetch when no key set is
+        loaded yet, or when the `kid` is unknown (for example after a key rotation) and
+        the last refresh is older than `min_refresh_interval`.
+        """
+        if self.client._jwks_data is None:
+            await self.refresh()
+            return
+
+        from auth0_api_python.utils import get_unverified_header
+
+        try:
+            kid = get_unverified_header(token).get("kid")
+        except Exception:
+            # Malformed tokens are reported by verify_access_token
+            return
+
+        if not kid or self.has_key(kid):
+            return
+        if time.monotonic() - self._last_refresh < self.min_refresh_interval:
+            return
+
+        logger.info(f"Unknown signing key '{kid}', refreshing JWKS")
+        await self.refresh()
+
+    @contextlib.asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        """
+        Warm the key set and keep refreshing it in the background while the context is open.
+
+        The first fetch is not awaited, so the server accepts connections while it
+        runs, and requests that need a key join it through `ensure_key`.
+        """
+        task = asyncio.create_task(self._refresh_loop())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _refresh_loop(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            # Verification falls back to fetching keys on the first request
+            logger.warning("Failed to prefetch JWKS", exc_info=True)
+
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep serving with the previous key set
+                logger.warning("Background JWKS refresh failed", exc_info=True)
+
+    async def _fetch(self) -> None:
+        from auth0_api_python.utils import fetch_jwks
+
+        metadata = await self.client._discover()
+        jwks_data = await fetch_jwks(
+            jwks_uri=metadata["jwks_uri"],
+            custom_fetch=self.client.options.custom_fetch
+        )
+        # The SDK reads keys from this attribute and otherwise never refreshes it
+        self.client._jwks_data = jwks_data
+        self._kids = frozenset(key["kid"] for key in jwks_data.get("keys", []) if key.get("kid"))
+        self._last_refresh = time.monotonic()
+        logger.info(f"Loaded {len(self._kids)} signing keys from {metadata['jwks_uri']}")
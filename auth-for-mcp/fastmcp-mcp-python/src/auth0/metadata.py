@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from urllib.parse import urlparse
+
+from starlette.types import Receive, Scope, Send
+
+Headers = list[tuple[bytes, bytes]]
+
+
+def resource_metadata_path(resource: str) -> str:
+    """
+    Path of the Protected Resource Metadata for a resource identifier, per RFC 9728 Section 3.1.
+
+    The well-known segment goes between the host and the resource path, so
+    `https://example.com/mcp` is described at `/.well-known/oauth-protected-resource/mcp`.
+    This matches `mcp.server.auth.routes.build_resource_metadata_url`, without importing
+    the SDK's OAuth server handlers at startup.
+    """
+    path = urlparse(resource).path
+    return "/.well-known/oauth-protected-resource" + (path if path != "/" else "")
+
+
+class StaticDocument:
+    """
+    ASGI app serving a JSON document that is rendered to bytes once.
+
+    The document is rendered on the first request after construction or after
+    `invalidate()`, together with a strong ETag and the complete response headers,
+    so serving it afterwards only writes pre-built bytes. Requests whose
+    `If-None-Match` matches the ETag get a 304 Not Modified without a body.
+
+    Args:
+        render: Callable returning the serialized document
+        max_age: Seconds clients may cache the document, 0 makes them revalidate on every use
+    """
+
+    def __init__(self, render: Callable[[], bytes], max_age: int = 0):
+        self.render = render
+        self.max_age = max_age
+        self._rendered: tuple[bytes, bytes, Headers, Headers] | None = None
+
+    def invalidate(self) -> None:
+        """Drop the rendered document so the next request renders it again."""
+        self._rendered = None
+
+    @property
+    def etag(self) -> str:
+        return self._render()[1].decode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body, etag, headers, not_modified_headers = self._render()
+
+        if self._matches(scope, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+    def _render(self) -> tuple[bytes, bytes, Headers, Headers]:
+        if self._rendered is None:
+            body = self.render()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'.encode()
+            cache_control = f"public, max-age={self.max_age}" if self.max_age > 0 else "no-cache"
+            not_modified_headers = [
+                (b"etag", etag),
+                (b"cache-control", cache_control.encode()),
+            ]
+            headers = [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *not_modified_headers,
+            ]
+            self._rendered = (body, etag, headers, not_modified_headers)
+        return self._rendered
+
+    @staticmethod
+    def _matches(scope: Scope, etag: bytes) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                # If-None-Match uses the weak comparison, so W/ prefixed tags match as well
+                candidates = (tag.strip().removeprefix(b"W/") for tag in value.split(b","))
+                return any(tag == etag or tag == b"*" for tag in candidates)
+        return False
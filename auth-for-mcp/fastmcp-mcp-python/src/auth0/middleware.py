@@ -1,37 +1,87 @@
+from __future__ import annotations
+
 import logging
+import time
 from collections.abc import Callable
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from auth0_api_python import ApiClient, ApiClientOptions
-from auth0_api_python.errors import VerifyAccessTokenError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import RejectionCache, TokenStore, token_digest
+from .errors import AuthenticationRequired, MalformedAuthorizationRequest, SessionNotFound, TooManyRequests
+from .issuers import IssuerRegistry, lazy_api_client
+from .jwks import JwksManager
+from .metrics import Auth0Metrics
+from .ratelimit import RateLimiter, unverified_claims, unverified_client_id
+from .sessions import SessionStore, session_identity
+from .timing import span
 
-from .errors import AuthenticationRequired, MalformedAuthorizationRequest
+if TYPE_CHECKING:
+    from auth0_api_python import ApiClient
 
 logger = logging.getLogger(__name__)
 
-class Auth0Middleware(BaseHTTPMiddleware):
+class Auth0Middleware:
     """
     Middleware that requires a valid Bearer token in the Authorization header.
     Validates the token using Auth0 SDK Client and stores auth info in request.state.auth.
+    Implemented as a pure ASGI middleware so streamed responses pass through untouched.
+    The ApiClient is requested from `get_client` on the first verification, so importing the
+    module does not import the Auth0 SDK.
+    When a TokenStore is provided, previously verified tokens are served from it.
+    When a JwksManager is provided, it is consulted so that unknown signing keys are refreshed.
+    When an IssuerRegistry is provided, each token is verified by the client and keys of the tenant
+    named by its unverified `iss` claim, and tokens from other issuers are rejected as invalid.
+    When a RejectionCache is provided, replayed tokens that failed verification are rejected without re-verifying.
+    When a RateLimiter is provided, every rejection counts against the remote address, and addresses that run
+    out of budget get 429 responses before any verification runs. A `client_limiter` does the same per
+    unverified client_id/azp at the remote address, with a tighter budget, so one client cannot use up an
+    address shared by many (for example behind a proxy). The claim is unverified, so it is never limited
+    across addresses, where anyone could use up another client's budget.
+    When a SessionStore is provided, the auth data of a request that opens an MCP session is bound to the
+    session ID, and later requests in the session that present the same token reuse it without verification.
+    A session can only be bound again to the same user (for example with a refreshed token).
+    When Auth0Metrics are provided, cache lookups and verification latency are recorded.
     """
 
-    def __init__(self, app: ASGIApp, domain: str, audience: str):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        domain: str,
+        audience: str,
+        cache: TokenStore | None = None,
+        get_client: Callable[[], ApiClient] | None = None,
+        jwks: JwksManager | None = None,
+        issuers: IssuerRegistry | None = None,
+        rejections: RejectionCache | None = None,
+        limiter: RateLimiter | None = None,
+        client_limiter: RateLimiter | None = None,
+        sessions: SessionStore | None = None,
+        metrics: Auth0Metrics | None = None
+    ):
+        self.app = app
         if not domain or not audience:
             raise RuntimeError("domain and audience must be provided")
-        self.client = ApiClient(ApiClientOptions(
-            domain=domain,
-            audience=audience
-        ))
+        self.get_client = get_client or lazy_api_client(domain=domain, audience=audience)
+        self.cache = cache
+        self.jwks = jwks
+        self.issuers = issuers
+        self.rejections = rejections
+        self.limiter = limiter
+        self.client_limiter = client_limiter
+        self.sessions = sessions
+        self.metrics = metrics
+
+    @property
+    def client(self) -> ApiClient:
+        return self.get_client()
 
     def _build_auth_data(self, token: dict[str, Any]) -> dict[str, Any]:
         """Extract authentication data from verified token."""
         client_id = token.get('client_id') or token.get('azp')
         if not client_id:
+            from auth0_api_python.errors import VerifyAccessTokenError
             raise VerifyAccessTokenError("Token missing 'client_id' or 'azp' claim")
 
         scopes = token.get("scope", "").split() if token.get("scope") else []
@@ -39,13 +89,15 @@ class Auth0Middleware(BaseHTTPMiddleware):
         auth_data = {
             "client_id": client_id,
             "scopes": scopes,
+            # Parsed once per token, tool scope checks are subset tests against it
+            "scope_set": frozenset(scopes),
         }
 
         if expires_at := token.get('exp'):
             auth_data["expires_at"] = expires_at
 
         # Extract extra claims with dict comprehension
-        extra_fields = {'sub', 'azp', 'name', 'email', 'client_id'}
+        extra_fields = {'sub', 'iss', 'azp', 'name', 'email', 'client_id'}
         auth_data["extra"] = {
             field: token[field]
             for field in extra_fields
@@ -54,29 +106,170 @@ class Auth0Middleware(BaseHTTPMiddleware):
 
         return auth_data
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Extract Authorization header
-        auth_header = request.headers.get("authorization")
-        if not auth_header:
-            raise MalformedAuthorizationRequest("Missing Authorization header")
-        if not auth_header.lower().startswith("bearer "):
-            raise MalformedAuthorizationRequest("Invalid Authorization header format")
+    async def authenticate(self, token: str, address: str | None = None) -> dict[str, Any]:
+        """
+        Verify a bearer token, or serve it from the cache, and return its auth data.
 
-        # Extract and verify token
-        token = auth_header[7:].strip() # Remove "Bearer " prefix
-        try:
-            decoded_and_verified_token = await self.client.verify_access_token(
-                token,
-                required_claims=["sub"]
-            )
+        Raises:
+            AuthenticationRequired: If the token is invalid or was rejected recently
+            TooManyRequests: If the token's client ID or the remote address sent too many invalid tokens
+        """
+        digest = token_digest(token) if self.cache is not None or self.rejections is not None else None
+        with span("token_cache"):
+            auth_data = await self.cache.lookup(digest) if self.cache is not None else None
+        if self.cache is not None and self.metrics is not None:
+            self.metrics.token_cache_requests.inc(result="hit" if auth_data is not None else "miss")
+        if auth_data is not None:
+            return auth_data
+
+        if self.rejections is not None and digest in self.rejections:
+            raise AuthenticationRequired("Invalid token")
 
-            # Set up authentication context
-            request.state.auth = self._build_auth_data(decoded_and_verified_token)
+        limits = self._limits(token, address)
+        for limiter, key in limits:
+            if retry_after := limiter.retry_after(key):
+                raise TooManyRequests(retry_after=retry_after)
 
-            return await call_next(request)
+        from auth0_api_python.errors import VerifyAccessTokenError
+
+        start = time.perf_counter()
+        try:
+            with span("verify"):
+                client, jwks = self._verifier(token)
+                if jwks is not None:
+                    await jwks.ensure_key(token)
+                decoded_and_verified_token = await client.verify_access_token(
+                    token,
+                    required_claims=["sub"]
+                )
+                auth_data = self._build_auth_data(decoded_and_verified_token)
         except VerifyAccessTokenError:
+            self._observe_verification(start, "invalid")
+            if self.rejections is not None:
+                self.rejections.add(digest)
+            for limiter, key in limits:
+                limiter.consume(key)
             logger.info("Token verification failed")
-            raise AuthenticationRequired("Invalid token")
+            raise AuthenticationRequired("Invalid token") from None
+        self._observe_verification(start, "valid")
+
+        if self.cache is not None:
+            await self.cache.store(digest, auth_data)
+        return auth_data
+
+    async def authenticate_session(
+        self, session_id: str | None, token: str, address: str | None = None
+    ) -> tuple[dict[str, Any], bool]:
+        """
+        Return the auth data bound to an MCP session if the token is the one it was bound with, otherwise authenticate
+        the token. The flag is True when the auth data came from the session and the session needs no new binding.
+
+        Raises:
+            AuthenticationRequired: If the token is invalid or was rejected recently
+            TooManyRequests: If the token's client ID or the remote address sent too many invalid tokens
+            SessionNotFound: If the session is unknown or owned by another user
+        """
+        if session_id is None:
+            return await self.authenticate(token, address), False
+
+        with span("session"):
+            auth_data = self.sessions.lookup(session_id, token_digest(token))
+        if self.metrics is not None:
+            self.metrics.session_requests.inc(result="hit" if auth_data is not None else "miss")
+        if auth_data is not None:
+            return auth_data, True
+
+        auth_data = await self.authenticate(token, address)
+        owner = self.sessions.owner(session_id)
+        if owner is None:
+            # Sessions get their owner in the response that assigns their ID, so this one is unknown or was evicted
+            logger.info("Rejected a request for an unknown session")
+            raise SessionNotFound()
+        if owner != session_identity(auth_data):
+            logger.warning("Rejected a request for a session owned by another user")
+            raise SessionNotFound()
+        return auth_data, False
+
+    def _bind_on_response(self, send: Send, session_id: str | None, token: str, auth_data: dict[str, Any]) -> Send:
+        """Wrap `send` to bind the session the response belongs to once the request has succeeded."""
+        digest = token_digest(token)
+
+        async def send_and_bind(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                # An initialize request has no session ID yet, the server assigns it in the response
+                bound_id = session_id or next(
+                    (value.decode("latin-1") for name, value in message.get("headers", []) if name.lower() == b"mcp-session-id"),
+                    None,
+                )
+                if bound_id is not None:
+                    self.sessions.bind(bound_id, digest, auth_data)
+            await send(message)
+
+        return send_and_bind
+
+    def _verifier(self, token: str) -> tuple[ApiClient, JwksManager | None]:
+        """Return the client and signing keys that verify the token."""
+        if self.issuers is None:
+            return self.client, self.jwks
+        verifier = self.issuers.get(unverified_claims(token).get("iss"))
+        if verifier is None:
+            from auth0_api_python.errors import VerifyAccessTokenError
+            raise VerifyAccessTokenError("Token issuer is not trusted")
+        return verifier.client, verifier.jwks
+
+    def _observe_verification(self, start: float, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.token_verification_seconds.observe(time.perf_counter() - start, outcome=outcome)
+
+    def _limits(self, token: str, address: str | None) -> list[tuple[RateLimiter, str]]:
+        """Return the limiters and keys that a rejection of the token counts against."""
+        if not address:
+            return []
+        limits = []
+        if self.limiter is not None:
+            limits.append((self.limiter, address))
+        if self.client_limiter is not None and (client_id := unverified_client_id(token)):
+            limits.append((self.client_limiter, f"{client_id}@{address}"))
+        return limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        # Extract Authorization header
+        with span("header"):
+            auth_header = request.headers.get("authorization")
+            if not auth_header:
+                raise MalformedAuthorizationRequest("Missing Authorization header")
+            if not auth_header.lower().startswith("bearer "):
+                raise MalformedAuthorizationRequest("Invalid Authorization header format")
+
+        # Extract and verify token
+        token = auth_header[7:].strip() # Remove "Bearer " prefix
+        address = scope["client"][0] if scope.get("client") else None
+        session_id = request.headers.get("mcp-session-id") if self.sessions is not None else None
+        bound = False
+        try:
+            if self.sessions is None:
+                auth_data = await self.authenticate(token, address)
+            else:
+                auth_data, bound = await self.authenticate_session(session_id, token, address)
+        except (AuthenticationRequired, TooManyRequests, SessionNotFound):
+            raise
         except Exception:
             logger.exception("Unexpected error in middleware")
             raise
+
+        # Set up authentication context
+        request.state.auth = auth_data
+
+        if self.sessions is not None and not bound and scope["method"] != "DELETE":
+            send = self._bind_on_response(send, session_id, token, auth_data)
+        await self.app(scope, receive, send)
+
+        if self.sessions is not None and session_id is not None and scope["method"] == "DELETE":
+            # The client terminated the session
+            self.sessions.discard(session_id)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ContentBlock
+
+from .authz import REQUIRED_SCOPES_ATTR, UNCHECKED_ATTR, check_scopes
+from .bulkhead import BULKHEAD_ATTR, Bulkhead
+from .errors import AuthenticationRequired, InsufficientScope
+from .metrics import Auth0Metrics
+from .results import RESULT_TTL_ATTR, ToolResultCache, result_key
+from .timing import span, timed_by
+
+
+class Auth0FastMCP(FastMCP):
+    """
+    FastMCP server that enforces the scopes declared with `@require_scopes`.
+
+    Required scopes are compiled into a per-tool table when a tool is added. On
+    each call the table is consulted before FastMCP validates the arguments, and
+    the requirement is checked against the immutable scope set that
+    `Auth0Middleware` parses once per verified token, so a rejected call costs
+    one dictionary lookup and one subset test.
+
+    When a `ToolResultCache` is given, results of tools annotated with
+    `readOnlyHint` are cached per user, after the scope check has passed. Tools
+    declared with `@bulkhead` run behind their own concurrency limit, queue and
+    timeout, which cached results bypass. When `Auth0Metrics` are given, call
+    latency, errors, scope rejections, queue wait and shed calls are recorded.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        result_cache: ToolResultCache | None = None,
+        metrics: Auth0Metrics | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.result_cache = result_cache
+        self.metrics = metrics
+        self._required_scopes: dict[str, frozenset[str]] = {}
+        # Read-only tools mapped to their result TTL override, None uses the cache default
+        self._result_ttls: dict[str, float | None] = {}
+        self._bulkheads: dict[str, Bulkhead] = {}
+
+    def add_tool(self, fn: Any, name: str | None = None, **kwargs: Any) -> None:
+        # Scopes are checked from the table below, so the @require_scopes wrapper is not needed
+        super().add_tool(getattr(fn, UNCHECKED_ATTR, fn), name=name, **kwargs)
+        tool_name = name or fn.__name__
+        if required := getattr(fn, REQUIRED_SCOPES_ATTR, None):
+            self._required_scopes[tool_name] = required
+        else:
+            self._required_scopes.pop(tool_name, None)
+
+        tool = self._tool_manager.get_tool(tool_name)
+        if tool and tool.annotations and tool.annotations.readOnlyHint:
+            self._result_ttls[tool_name] = getattr(fn, RESULT_TTL_ATTR, None)
+        else:
+            self._result_ttls.pop(tool_name, None)
+
+        if limits := getattr(fn, BULKHEAD_ATTR, None):
+            self._bulkheads[tool_name] = Bulkhead(tool_name, **limits, metrics=self.metrics)
+        else:
+            self._bulkheads.pop(tool_name, None)
+
+    def remove_tool(self, name: str) -> None:
+        super().remove_tool(name)
+        self._required_scopes.pop(name, None)
+        self._result_ttls.pop(name, None)
+        self._bulkheads.pop(name, None)
+
+    def required_scopes(self, name: str) -> frozenset[str]:
+        """Return the scopes a tool requires, empty if it requires none."""
+        return self._required_scopes.get(name, frozenset())
+
+    def bulkhead(self, name: str) -> Bulkhead | None:
+        """Return the bulkhead a tool runs behind, None if it has none."""
+        return self._bulkheads.get(name)
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[ContentBlock] | dict[str, Any]:
+        request = self._request()
+        with timed_by(getattr(request.state, "server_timing", None) if request is not None else None):
+            return await self._observe_call_tool(name, arguments)
+
+    async def _observe_call_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[ContentBlock] | dict[str, Any]:
+        if self.metrics is None:
+            return await self._call_tool(name, arguments)
+
+        # Only label with registered tool names, so arbitrary names cannot grow the series
+        tool = name if self._tool_manager.get_tool(name) else "unknown"
+        start = time.perf_counter()
+        try:
+            return await self._call_tool(name, arguments)
+        except Exception as exc:
+            self.metrics.tool_errors.inc(tool=tool)
+            if isinstance(exc, (AuthenticationRequired, InsufficientScope)):
+                self.metrics.auth_rejections.inc(error_code=exc.error_code)
+            raise
+        finally:
+            self.metrics.tool_call_seconds.observe(time.perf_counter() - start, tool=tool)
+
+    async def _call_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[ContentBlock] | dict[str, Any]:
+        if required := self._required_scopes.get(name):
+            with span("scope"):
+                check_scopes(self._auth(), required)
+
+        call = functools.partial(self._run_tool, name, arguments)
+        if bulkhead := self._bulkheads.get(name):
+            call = functools.partial(bulkhead.run, call)
+
+        if self.result_cache is not None and name in self._result_ttls:
+            ttl = self._result_ttls[name]
+            ttl = self.result_cache.ttl if ttl is None else ttl
+            auth = self._auth()
+            claims = auth.get("extra", {}) if auth else {}
+            if ttl > 0 and (sub := claims.get("sub")):
+                return await self.result_cache.get_or_call(result_key(name, arguments, sub, claims.get("iss")), ttl, call)
+
+        return await call()
+
+    async def _run_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[ContentBlock] | dict[str, Any]:
+        with span("tool"):
+            return await super().call_tool(name, arguments)
+
+    def _request(self) -> Any:
+        try:
+            return self.get_context().request_context.request
+        except ValueError:
+            # Called outside of an MCP request
+            return None
+
+    def _auth(self) -> dict[str, Any] | None:
+        request = self._request()
+        return getattr(request.state, "auth", None) if request is not None else None
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hmac
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class BoundSession:
+    """The auth data a session was authenticated with and the digest of the token that proved it."""
+
+    digest: str
+    auth_data: dict[str, Any]
+    last_used: float
+
+
+def session_identity(auth_data: dict[str, Any]) -> tuple[str | None, str | None]:
+    """Return the (iss, sub) of auth data, the user a session is bound to."""
+    extra = auth_data.get("extra", {})
+    return extra.get("iss"), extra.get("sub")
+
+
+class SessionStore:
+    """
+    Bounded in-process map of MCP session IDs to the auth data they were bound to.
+
+    In stateful mode a session is bound when its first request has been
+    authenticated, and later requests in the session that present the same
+    token reuse the bound auth data without verifying it again. An entry is
+    dropped at the token's `exp` claim or once the session has been idle for
+    `idle_ttl` seconds, whichever comes first, and the least recently used
+    session is evicted once `max_size` is reached. A dropped session is bound
+    again by its next request, after a full verification.
+
+    The user (iss, sub) that opened a session is kept separately, for as long
+    as the session lives: until it is discarded, or evicted as the least
+    recently used of `max_owners` sessions. Only that user can bind the session
+    again, and a session without an owner cannot be bound by anyone.
+
+    Args:
+        max_size: Maximum number of sessions whose auth data is kept in memory
+        idle_ttl: Seconds without requests after which a session's binding is dropped
+        max_owners: Maximum number of sessions whose owner is kept in memory
+
+    Raises:
+        ValueError: If max_size, idle_ttl or max_owners is not positive
+    """
+
+    def __init__(self, max_size: int = 1024, idle_ttl: float = 1800.0, max_owners: int = 65536):
+        if max_size <= 0 or idle_ttl <= 0 or max_owners <= 0:
+            raise ValueError("max_size, idle_ttl and max_owners must be positive")
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.max_owners = max_owners
+        self.hits = 0
+        self.misses = 0
+        self._sessions: OrderedDict[str, BoundSession] = OrderedDict()
+        self._owners: OrderedDict[str, tuple[str | None, str | None]] = OrderedDict()
+
+    def lookup(self, session_id: str, digest: str) -> dict[str, Any] | None:
+        """Return the auth data a session is bound to if it was bound with the same token, otherwise None."""
+        session = self._get(session_id)
+        if session is None or not hmac.compare_digest(session.digest, digest):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return session.auth_data
+
+    def owner(self, session_id: str) -> tuple[str | None, str | None] | None:
+        """Return the (iss, sub) of the user that opened a session, or None if the session is unknown."""
+        owner = self._owners.get(session_id)
+        if owner is not None:
+            self._owners.move_to_end(session_id)
+        return owner
+
+    def bind(self, session_id: str, digest: str, auth_data: dict[str, Any]) -> None:
+        """Bind a session to freshly verified auth data of its owner, replacing any previous binding."""
+        self._sessions[session_id] = BoundSession(digest, auth_data, time.monotonic())
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_size:
+            self._sessions.popitem(last=False)
+
+        self._owners[session_id] = session_identity(auth_data)
+        self._owners.move_to_end(session_id)
+        while len(self._owners) > self.max_owners:
+            self._owners.popitem(last=False)
+
+    def discard(self, session_id: str) -> None:
+        """Forget a terminated session, its binding and its owner."""
+        self._sessions.pop(session_id, None)
+        self._owners.pop(session_id, None)
+
+    def stats(self) -> dict[str, int]:
+        """Return the current size, number of known sessions and hit/miss counters."""
+        return {"size": len(self._sessions), "owners": len(self._owners), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _get(self, session_id: str) -> BoundSession | None:
+        self._evict_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+
+        if (exp := session.auth_data.get("expires_at")) and time.time() >= exp:
+            del self._sessions[session_id]
+            return None
+
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _evict_idle(self) -> None:
+        # Sessions are kept in order of last use, so the idle ones are at the front
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > cutoff:
+                break
+            del self._sessions[session_id]
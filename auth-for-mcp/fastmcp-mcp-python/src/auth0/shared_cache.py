@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any
+
+from .cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "auth0:token:"
+
+
+class RedisTokenCache:
+    """
+    Verified-token cache shared by server processes through a Redis-protocol server.
+
+    Lookups check a bounded in-process `TokenCache` first and fall back to the
+    shared server, so a token verified by one uvicorn worker is trusted by the
+    others without verifying its signature again. Shared entries expire at the
+    token's `exp` claim or after `max_ttl` seconds, whichever comes first, and
+    local copies never outlive the shared entry. When the shared server is
+    unavailable, lookups miss and tokens are verified as usual.
+
+    Requires the `redis` package.
+
+    Args:
+        url: Server URL, e.g. redis://localhost:6379/0
+        max_size: Maximum number of verified tokens kept in each process
+        max_ttl: Maximum number of seconds a verified token is trusted without re-verification
+        key_prefix: Prefix of the keys written to the shared server
+        timeout: Seconds to wait for the shared server before treating a lookup as a miss
+
+    Raises:
+        RuntimeError: If the redis package is not installed
+        ValueError: If max_size or max_ttl is not positive
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_size: int = 1024,
+        max_ttl: float = 300.0,
+        key_prefix: str = KEY_PREFIX,
+        timeout: float = 0.25,
+    ):
+        try:
+            from redis.asyncio import Redis
+            from redis.exceptions import RedisError
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis token cache backend requires the 'redis' package, install it with `poetry install --extras redis`"
+            ) from e
+
+        self.local = TokenCache(max_size, max_ttl)
+        self.max_ttl = max_ttl
+        self.key_prefix = key_prefix
+        self.client = Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.errors = 0
+        self._errors = (RedisError, OSError)
+
+    async def lookup(self, digest: str) -> dict[str, Any] | None:
+        """Return cached auth data from this process or the shared server, or None."""
+        auth_data = self.local.get(digest)
+        if auth_data is not None:
+            return auth_data
+
+        try:
+            value = await self.client.get(self.key_prefix + digest)
+        except self._errors as e:
+            self.errors += 1
+            logger.warning(f"Shared token cache lookup failed: {e}")
+            return None
+        if value is None:
+            self.shared_misses += 1
+            return None
+
+        try:
+            entry = json.loads(value)
+            auth_data = entry["auth"]
+            # Frozensets are not JSON serializable, rebuild the parsed scope set
+            auth_data["scope_set"] = frozenset(auth_data["scopes"])
+            until = float(entry["until"])
+        except (ValueError, KeyError, TypeError) as e:
+            # Corrupt, or written by another version: drop it so the token is verified and stored again
+            self.errors += 1
+            logger.warning(f"Ignored an unreadable shared token cache entry: {e!r}")
+            await self._delete(digest)
+            return None
+
+        self.local.set(digest, auth_data, expires_at=until)
+        self.shared_hits += 1
+        return auth_data
+
+    async def store(self, digest: str, auth_data: dict[str, Any]) -> None:
+        """Cache auth data in this process and publish it to the other processes."""
+        until = time.time() + self.max_ttl
+        if exp := auth_data.get("expires_at"):
+            until = min(until, exp)
+        self.local.set(digest, auth_data, expires_at=until)
+
+        ttl_ms = int((until - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        payload = json.dumps({
+            "until": until,
+            "auth": {key: value for key, value in auth_data.items() if key != "scope_set"},
+        })
+        try:
+            await self.client.set(self.key_prefix + digest, payload, px=ttl_ms)
+        except self._errors as e:
+            self.errors += 1
+            logger.warning(f"Shared token cache store failed: {e}")
+
+    async def _delete(self, digest: str) -> None:
+        try:
+            await self.client.delete(self.key_prefix + digest)
+        except self._errors as e:
+            self.errors += 1
+            logger.warning(f"Shared token cache delete failed: {e}")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> dict[str, int]:
+        """Return the local cache stats and the shared hit/miss/error counters."""
+        return {
+            **self.local.stats(),
+            "shared_hits": self.shared_hits,
+            "shared_misses": self.shared_misses,
+            "errors": self.errors,
+        }
+
+    def __len__(self) -> int:
+        return len(self.local)
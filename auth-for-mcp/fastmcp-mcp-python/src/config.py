@@ -12,8 +12,32 @@ class Config:
     auth0_audience: str
     mcp_server_url: str
     port: int = 3001
+    workers: int = 1
     debug: bool = True
     cors_origins: list[str] = field(default_factory=lambda: ["*"])
+    token_cache_size: int = 1024
+    token_cache_ttl: float = 300.0
+    token_cache_backend: str = "memory"
+    token_cache_url: str = "redis://localhost:6379/0"
+    jwks_refresh_interval: float = 600.0
+    issuer_domains: list[str] = field(default_factory=list)
+    issuer_cache_size: int = 16
+    metadata_max_age: int = 0
+    rejection_cache_size: int = 1024
+    rejection_cache_ttl: float = 30.0
+    rejection_rate: float = 1.0
+    rejection_burst: int = 20
+    client_rejection_rate: float = 0.2
+    client_rejection_burst: int = 5
+    tool_result_cache_size: int = 0
+    tool_result_cache_ttl: float = 30.0
+    tool_result_cache_stale_ttl: float = 30.0
+    stateless_http: bool = True
+    session_cache_size: int = 1024
+    session_idle_ttl: float = 1800.0
+    metrics_enabled: bool = False
+    server_timing: bool = False
+    server_timing_log: bool = False
 
     @classmethod
     def from_env(cls) -> Config:
@@ -30,8 +54,32 @@ class Config:
             auth0_audience=auth0_audience,
             mcp_server_url=os.getenv("MCP_SERVER_URL", "http://localhost:3001"),
             port=int(os.getenv("PORT", "3001")),
+            workers=int(os.getenv("WORKERS", "1")),
             debug=os.getenv("DEBUG", "false").lower() == "true",
             cors_origins=os.getenv("CORS_ORIGINS", "*").split(","),
+            token_cache_size=int(os.getenv("TOKEN_CACHE_SIZE", "1024")),
+            token_cache_ttl=float(os.getenv("TOKEN_CACHE_TTL", "300")),
+            token_cache_backend=os.getenv("TOKEN_CACHE_BACKEND", "memory"),
+            token_cache_url=os.getenv("TOKEN_CACHE_URL", "redis://localhost:6379/0"),
+            jwks_refresh_interval=float(os.getenv("JWKS_REFRESH_INTERVAL", "600")),
+            issuer_domains=[domain.strip() for domain in os.getenv("AUTH0_ISSUER_DOMAINS", "").split(",") if domain.strip()],
+            issuer_cache_size=int(os.getenv("ISSUER_CACHE_SIZE", "16")),
+            metadata_max_age=int(os.getenv("METADATA_MAX_AGE", "0")),
+            rejection_cache_size=int(os.getenv("REJECTION_CACHE_SIZE", "1024")),
+            rejection_cache_ttl=float(os.getenv("REJECTION_CACHE_TTL", "30")),
+            rejection_rate=float(os.getenv("REJECTION_RATE", "1")),
+            rejection_burst=int(os.getenv("REJECTION_BURST", "20")),
+            client_rejection_rate=float(os.getenv("CLIENT_REJECTION_RATE", "0.2")),
+            client_rejection_burst=int(os.getenv("CLIENT_REJECTION_BURST", "5")),
+            tool_result_cache_size=int(os.getenv("TOOL_RESULT_CACHE_SIZE", "0")),
+            tool_result_cache_ttl=float(os.getenv("TOOL_RESULT_CACHE_TTL", "30")),
+            tool_result_cache_stale_ttl=float(os.getenv("TOOL_RESULT_CACHE_STALE_TTL", "30")),
+            stateless_http=os.getenv("STATELESS_HTTP", "true").lower() == "true",
+            session_cache_size=int(os.getenv("SESSION_CACHE_SIZE", "1024")),
+            session_idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "1800")),
+            metrics_enabled=os.getenv("METRICS_ENABLED", "false").lower() == "true",
+            server_timing=os.getenv("SERVER_TIMING", "false").lower() == "true",
+            server_timing_log=os.getenv("SERVER_TIMING_LOG", "false").lower() == "true",
         )
 
 
@@ -1,13 +1,8 @@
 from __future__ import annotations
 
-import contextlib
 import logging
-from collections.abc import AsyncIterator
-
-from starlette.applications import Starlette
-from starlette.middleware.cors import CORSMiddleware
-from starlette.routing import Mount
 
+from .app import create_app
 from .auth0 import Auth0Mcp
 from .config import get_config
 from .tools import register_tools
@@ -22,43 +17,41 @@ auth0_mcp = Auth0Mcp(
     name="Example FastMCP Server",
     audience=config.auth0_audience,
     domain=config.auth0_domain,
-    mcp_server_url=config.mcp_server_url
+    mcp_server_url=config.mcp_server_url,
+    token_cache_size=config.token_cache_size,
+    token_cache_ttl=config.token_cache_ttl,
+    token_cache_backend=config.token_cache_backend,
+    token_cache_url=config.token_cache_url,
+    jwks_refresh_interval=config.jwks_refresh_interval,
+    issuer_domains=config.issuer_domains,
+    issuer_cache_size=config.issuer_cache_size,
+    metadata_max_age=config.metadata_max_age,
+    server_timing=config.server_timing,
+    server_timing_log=config.server_timing_log,
+    rejection_cache_size=config.rejection_cache_size,
+    rejection_cache_ttl=config.rejection_cache_ttl,
+    rejection_rate=config.rejection_rate,
+    rejection_burst=config.rejection_burst,
+    client_rejection_rate=config.client_rejection_rate,
+    client_rejection_burst=config.client_rejection_burst,
+    tool_result_cache_size=config.tool_result_cache_size,
+    tool_result_cache_ttl=config.tool_result_cache_ttl,
+    tool_result_cache_stale_ttl=config.tool_result_cache_stale_ttl,
+    stateless_http=config.stateless_http,
+    session_cache_size=config.session_cache_size,
+    session_idle_ttl=config.session_idle_ttl,
 )
 register_tools(auth0_mcp)
 
-@contextlib.asynccontextmanager
-async def lifespan(app: Starlette) -> AsyncIterator[None]:
-    async with contextlib.AsyncExitStack() as stack:
-        await stack.enter_async_context(auth0_mcp.mcp.session_manager.run())
-        yield
-
-starlette_app = Starlette(
-    debug=config.debug,
-    routes=[
-        # Add discovery metadata route
-        Mount("/", app=auth0_mcp.auth_metadata_router()),
-
-        # Main MCP app route with authentication middleware
-        Mount(
-            "/",
-            app=auth0_mcp.mcp.streamable_http_app(),
-            middleware=auth0_mcp.auth_middleware()
-        ),
-    ],
-    lifespan=lifespan,
-    exception_handlers=auth0_mcp.exception_handlers(),
-)
-
-# Wrap ASGI application with CORS middleware to expose Mcp-Session-Id header
-# for browser-based clients (ensures 500 errors get proper CORS headers)
-
-app = CORSMiddleware(
-    starlette_app,
-    allow_origins=config.cors_origins,
-    allow_methods=["GET", "POST", "DELETE"], # MCP streamable HTTP methods
-    expose_headers=["Mcp-Session-Id"],
-)
+app = create_app(auth0_mcp, config)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, port=config.port)
+    if config.workers > 1:
+        # Each worker process imports this module and builds its own app; set
+        # TOKEN_CACHE_BACKEND=redis so tokens verified by one worker are trusted by the others
+        if not config.stateless_http:
+            logger.warning("MCP sessions live in one worker process, run a single worker with STATELESS_HTTP=false")
+        uvicorn.run("src.server:app", port=config.port, workers=config.workers)
+    else:
+        uvicorn.run(app, port=config.port)
@@ -4,6 +4,7 @@ from mcp.server.fastmcp import Context
 
 from .auth0 import Auth0Mcp
 from .auth0.authz import register_required_scopes, require_scopes
+from .auth0.results import result_ttl
 
 
 def register_tools(auth0_mcp: Auth0Mcp) -> None:
@@ -19,6 +20,7 @@ def register_tools(auth0_mcp: Auth0Mcp) -> None:
         description="Returns the current UTC date and time",
         annotations={"readOnlyHint": True}
     )
+    @result_ttl(0)  # The result changes on every call, never cache it
     async def get_datetime() -> str:
         """Returns the current UTC date and time"""
         from datetime import datetime, timezone
@@ -46,6 +48,7 @@ def register_tools(auth0_mcp: Auth0Mcp) -> None:
         annotations={"readOnlyHint": True}
     )
     @require_scopes(["tool:whoami"])
+    @result_ttl(0)  # The result includes the token's scopes and client, not only its `sub`
     async def whoami(ctx: Context) -> str:
         auth_info = ctx.request_context.request.state.auth
 
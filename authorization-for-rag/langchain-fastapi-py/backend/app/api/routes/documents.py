@@ -1,8 +1,6 @@
 from datetime import datetime
 import base64
 import uuid
-import PyPDF2
-from io import BytesIO
 from fastapi import APIRouter, Depends, File, UploadFile
 from fastapi.exceptions import HTTPException
 from pydantic import BaseModel
@@ -11,8 +9,9 @@ from sqlmodel import Session, select, update, col, delete
 from app.core.auth import auth_client
 from app.core.db import engine
 from app.core.fga import authorization_manager
-from app.models.documents import Document, DocumentWithoutContent
-from app.core.rag import generate_embeddings
+from app.core.ingestion import ingestion_workers
+from app.models.documents import Document, DocumentWithoutContent, UploadedDocument
+from app.models.ingestion_jobs import IngestionJob
 
 documents_router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -56,10 +55,10 @@ def get_documents(
         ]
 
 
-@documents_router.post("/upload")
+@documents_router.post("/upload", status_code=202)
 async def upload_document(
     file: UploadFile = File(), auth_session=Depends(auth_client.require_session)
-) -> DocumentWithoutContent:
+) -> UploadedDocument:
     user = auth_session.get("user")
 
     binary_content = await file.read()
@@ -82,16 +81,6 @@ async def upload_document(
             detail=f"File size exceeds the maximum allowed size of {MAX_FILE_SIZE_MB} MB",
         )
 
-    # Get the document's content
-    file_text = ""
-    if file_type == "application/pdf":
-        pdf_stream = BytesIO(binary_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_stream)
-        for page in pdf_reader.pages:
-            file_text += page.extract_text()
-    else:
-        file_text = binary_content.decode("utf-8")
-
     with Session(engine) as db_session:
         # Create the document
         document = Document(
@@ -107,20 +96,40 @@ async def upload_document(
 
         db_session.add(document)
 
-        embeddings = generate_embeddings(
-            document_id=document.id, file_name=file_name, text=file_text
+        # The text is extracted, chunked and embedded by the ingestion workers
+        job = IngestionJob(
+            document_id=document.id,
+            user_id=user.get("sub"),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
         )
-
-        if len(embeddings) > 0:
-            db_session.add_all(embeddings)
+        db_session.add(job)
 
         doc_id = str(document.id)
         db_session.commit()
 
+        # Queued before anything else can fail, so every committed job gets a worker
+        ingestion_workers.submit(job.id)
+
         # Write the relationship tuple to FGA
         await authorization_manager.add_relation(user.get("email"), doc_id)
 
-        return document
+        return UploadedDocument.model_validate(document, update={"job_id": job.id})
+
+
+@documents_router.get("/jobs/{job_id}")
+def get_ingestion_job(
+    job_id: uuid.UUID, auth_session=Depends(auth_client.require_session)
+) -> IngestionJob:
+    user = auth_session.get("user")
+
+    with Session(engine) as db_session:
+        job = db_session.get(IngestionJob, job_id)
+
+        if not job or job.user_id != user.get("sub"):
+            raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+        return job
 
 
 @documents_router.get(
@@ -0,0 +1,131 @@
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Literal
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# Input limit of OpenAI's text-embedding-3 models
+MAX_CHUNK_TOKENS = 8191
+# Separates the pages of a PDF in its extracted text
+PAGE_BREAK = "\f"
+
+TEXT_SEPARATORS = ("\n\n", "\n", " ", "")
+# Headings up to level 3 already start a section of their own
+MARKDOWN_SEPARATORS = ("\n#### ", "\n##### ", "\n###### ") + TEXT_SEPARATORS
+
+_HEADING = re.compile(r"^(#{1,3})[ \t]+(.+?)[ \t#]*$")
+_FENCE = re.compile(r"^[ \t]*(```|~~~)")
+
+
+@dataclass(frozen=True)
+class ChunkingProfile:
+    """
+    How the text of one type of file is split into the chunks that are embedded.
+
+    Sizes are in tokens of the embedding model. A chunk never crosses a
+    boundary of the profile's `sections`: markdown headings up to level 3,
+    whose titles are repeated at the top of each of their chunks, or the pages
+    of a PDF. Within a section, text is split on the first of the `separators`
+    that keeps chunks within `chunk_tokens`, with `chunk_overlap` tokens
+    repeated between consecutive chunks.
+    """
+
+    name: str
+    chunk_tokens: int = 512
+    chunk_overlap: int = 64
+    sections: Literal["none", "markdown", "pages"] = "none"
+    separators: tuple[str, ...] = TEXT_SEPARATORS
+
+    def __post_init__(self):
+        if not 0 < self.chunk_tokens <= MAX_CHUNK_TOKENS:
+            raise ValueError(f"chunk_tokens must be between 1 and {MAX_CHUNK_TOKENS}")
+        if not 0 <= self.chunk_overlap < self.chunk_tokens:
+            raise ValueError("chunk_overlap must be at least 0 and less than chunk_tokens")
+
+
+def default_profiles(
+    chunk_tokens: int = 512, chunk_overlap: int = 64
+) -> dict[str, ChunkingProfile]:
+    """Return the chunking profile of each file type that can be uploaded."""
+    return {
+        "text/plain": ChunkingProfile("text", chunk_tokens, chunk_overlap),
+        "text/markdown": ChunkingProfile(
+            "markdown",
+            chunk_tokens,
+            chunk_overlap,
+            sections="markdown",
+            separators=MARKDOWN_SEPARATORS,
+        ),
+        "application/pdf": ChunkingProfile(
+            "pdf", chunk_tokens, chunk_overlap, sections="pages"
+        ),
+    }
+
+
+def chunk_text(
+    text: str, profile: ChunkingProfile, length_function: Callable[[str], int]
+) -> list[str]:
+    """Split text into chunks with a profile, measuring lengths in tokens with `length_function`."""
+    chunks: list[str] = []
+
+    for heading, body in _sections(text, profile.sections):
+        budget = profile.chunk_tokens
+        if heading:
+            budget -= length_function(heading)
+            if budget <= profile.chunk_overlap:
+                # Headings too long to repeat are left in the section's first chunk only
+                heading, body, budget = "", heading + body, profile.chunk_tokens
+
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=budget,
+            chunk_overlap=profile.chunk_overlap,
+            length_function=length_function,
+            separators=list(profile.separators),
+        )
+        chunks.extend(heading + chunk for chunk in splitter.split_text(body))
+
+    return chunks
+
+
+def _sections(
+    text: str, sections: Literal["none", "markdown", "pages"]
+) -> Iterator[tuple[str, str]]:
+    """Yield the (heading, body) of each section of text that chunks must not cross."""
+    if sections == "pages":
+        for page in text.split(PAGE_BREAK):
+            yield "", page
+    elif sections == "markdown":
+        yield from _markdown_sections(text)
+    else:
+        yield "", text
+
+
+def _markdown_sections(text: str) -> Iterator[tuple[str, str]]:
+    # Titles of the current heading and its parents, by level
+    titles: list[str] = []
+    lines: list[str] = []
+    in_code = False
+
+    for line in text.splitlines(keepends=True):
+        if _FENCE.match(line):
+            in_code = not in_code
+        elif not in_code and (match := _HEADING.match(line.rstrip("\r\n"))):
+            yield _heading(titles), "".join(lines)
+            level = len(match.group(1))
+            titles = titles[: level - 1] + [""] * (level - 1 - len(titles))
+            titles.append(match.group(2))
+            lines = []
+            continue
+        lines.append(line)
+
+    yield _heading(titles), "".join(lines)
+
+
+def _heading(titles: list[str]) -> str:
+    path = [
+        f"{'#' * level} {title}\n"
+        for level, title in enumerate(titles, start=1)
+        if title
+    ]
+    return "".join(path) + "\n" if path else ""
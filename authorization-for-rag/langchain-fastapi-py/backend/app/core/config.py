@@ -37,6 +37,21 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
 
+    # Document ingestion
+    INGESTION_WORKERS: int = 2
+    # Size of chunks in tokens of the embedding model, and tokens repeated between consecutive chunks
+    CHUNK_TOKENS: int = 512
+    CHUNK_OVERLAP_TOKENS: int = 64
+    EMBEDDING_BATCH_SIZE: int = 256
+    EMBEDDING_BATCH_TOKENS: int = 50_000
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_MAX_RETRIES: int = 6
+    EMBEDDING_CACHE_ENABLED: bool = True
+    # Provider price and request seconds per token of the embedding model, used to report what the
+    # cache saved. The seconds are measured once the server has sent a request, this is the estimate before.
+    EMBEDDING_PRICE_PER_MILLION_TOKENS: float = 0.02
+    EMBEDDING_SECONDS_PER_TOKEN: float = 0.00003
+
     # LangGraph server
     LANGGRAPH_API_URL: str = "http://localhost:54367"
     LANGGRAPH_API_KEY: str = ""
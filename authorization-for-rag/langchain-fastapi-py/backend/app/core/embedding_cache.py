@@ -0,0 +1,67 @@
+import hashlib
+import unicodedata
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, col, select
+
+from app.core.db import engine
+from app.models.embeddings import EmbeddingCache
+
+# Rows per statement, well below the bind parameter limit of Postgres
+BATCH_SIZE = 1000
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of a chunk's normalized text."""
+    # Chunks that only differ in Unicode form or whitespace share an embedding
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def get_cached_embeddings(
+    model: str, hashes: list[str]
+) -> dict[str, list[float]]:
+    """Return the cached embeddings of a model for the given content hashes, in bulk."""
+    cached: dict[str, list[float]] = {}
+
+    with Session(engine) as db_session:
+        for start in range(0, len(hashes), BATCH_SIZE):
+            rows = db_session.exec(
+                select(EmbeddingCache.content_hash, EmbeddingCache.embedding)
+                .where(EmbeddingCache.model == model)
+                .where(
+                    col(EmbeddingCache.content_hash).in_(
+                        hashes[start : start + BATCH_SIZE]
+                    )
+                )
+            ).all()
+            cached.update(
+                (chunk_hash, list(embedding)) for chunk_hash, embedding in rows
+            )
+
+    return cached
+
+
+def cache_embeddings(model: str, embeddings: dict[str, list[float]]):
+    """Store a model's embeddings by content hash, keeping entries that already exist."""
+    now = datetime.now()
+    rows = [
+        {
+            "model": model,
+            "content_hash": chunk_hash,
+            "embedding": embedding,
+            "created_at": now,
+        }
+        for chunk_hash, embedding in embeddings.items()
+    ]
+
+    with Session(engine) as db_session:
+        for start in range(0, len(rows), BATCH_SIZE):
+            db_session.exec(
+                insert(EmbeddingCache)
+                .values(rows[start : start + BATCH_SIZE])
+                # Another upload may have cached the same chunk in the meantime
+                .on_conflict_do_nothing()
+            )
+        db_session.commit()
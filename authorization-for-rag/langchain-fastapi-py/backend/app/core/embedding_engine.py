@@ -0,0 +1,189 @@
+import asyncio
+import functools
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+
+import openai
+import tiktoken
+from langchain_openai import OpenAIEmbeddings
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: rate limits, server errors, and connection errors and timeouts
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+)
+
+
+class EmbeddingEngine:
+    """
+    Embeds many texts with a bounded number of concurrent provider requests.
+
+    Texts are grouped, in order, into batches of at most `batch_size` texts and
+    `batch_tokens` tokens (a text that is longer on its own gets a batch of its
+    own). Batches are sent concurrently, but never more than `max_concurrency`
+    at once across every caller of the engine, so parallel uploads share the
+    same budget. A batch that is rate limited (429), or fails with a server or
+    connection error, is retried after an exponential backoff with jitter, or
+    after the provider's `Retry-After`, up to `max_retries` times. A 429 for an
+    exhausted quota never succeeds and fails at once. The engine owns retries,
+    so the model should be built with `max_retries=0`. Embeddings are returned
+    in the order of the texts.
+
+    The engine also tracks the provider's average request time per token, used
+    to estimate the time saved by embeddings that did not have to be requested.
+    """
+
+    def __init__(
+        self,
+        model: OpenAIEmbeddings,
+        batch_size: int = 256,
+        batch_tokens: int = 50_000,
+        max_concurrency: int = 4,
+        max_retries: int = 6,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        if batch_size <= 0 or batch_tokens <= 0 or max_concurrency <= 0:
+            raise ValueError(
+                "batch_size, batch_tokens and max_concurrency must be positive"
+            )
+        self.model = model
+        self.batch_size = batch_size
+        self.batch_tokens = batch_tokens
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._request_seconds = 0.0
+        self._request_tokens = 0
+
+    @property
+    def seconds_per_token(self) -> float | None:
+        """Average provider request time per token so far, None before the first request."""
+        if not self._request_tokens:
+            return None
+        return self._request_seconds / self._request_tokens
+
+    async def embed(
+        self,
+        texts: list[str],
+        on_progress: Callable[[int], Awaitable[None]] | None = None,
+        tokens: list[int] | None = None,
+    ) -> list[list[float]]:
+        """
+        Embed texts, calling `on_progress` with the number of texts embedded so far after each batch.
+
+        `tokens` are the texts' token counts, if the caller has already counted them.
+        """
+        if not texts:
+            return []
+
+        # Tokenizing a large document takes a while, keep it off the event loop
+        if tokens is None:
+            tokens = await asyncio.to_thread(self.count_tokens, texts)
+        batches = self.batches(texts, tokens)
+        results: list[list[list[float]]] = [[] for _ in batches]
+        done = 0
+
+        async def embed_batch(index: int, batch: list[str], batch_tokens: int):
+            nonlocal done
+            results[index] = await self._embed_batch(batch, batch_tokens)
+            done += len(batch)
+            if on_progress is not None:
+                await on_progress(done)
+
+        # The first batch that fails for good cancels the others
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for index, (batch, batch_tokens) in enumerate(batches):
+                    task_group.create_task(embed_batch(index, batch, batch_tokens))
+        except ExceptionGroup as group:
+            raise group.exceptions[0] from None
+
+        return [embedding for batch in results for embedding in batch]
+
+    @functools.cached_property
+    def _encoding(self) -> tiktoken.Encoding:
+        # Loaded on first use, tiktoken may have to download the encoding
+        return tiktoken.encoding_for_model(self.model.model)
+
+    def token_length(self, text: str) -> int:
+        """Return the number of tokens of a text for the engine's model."""
+        return len(self._encoding.encode_ordinary(text))
+
+    def count_tokens(self, texts: list[str]) -> list[int]:
+        """Return the number of tokens of each text for the engine's model."""
+        return [
+            len(tokens)
+            for tokens in self._encoding.encode_ordinary_batch(texts)
+        ]
+
+    def batches(
+        self, texts: list[str], tokens: list[int]
+    ) -> list[tuple[list[str], int]]:
+        """Group texts, in order, into batches within the item and token limits, with their token totals."""
+        batches: list[tuple[list[str], int]] = []
+        batch: list[str] = []
+        batch_tokens = 0
+
+        for text, text_tokens in zip(texts, tokens):
+            if batch and (
+                len(batch) >= self.batch_size
+                or batch_tokens + text_tokens > self.batch_tokens
+            ):
+                batches.append((batch, batch_tokens))
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += text_tokens
+
+        if batch:
+            batches.append((batch, batch_tokens))
+        return batches
+
+    async def _embed_batch(self, batch: list[str], batch_tokens: int) -> list[list[float]]:
+        attempt = 0
+        while True:
+            async with self._slots:
+                try:
+                    start = time.perf_counter()
+                    embeddings = await self.model.aembed_documents(
+                        batch, chunk_size=len(batch)
+                    )
+                    self._request_seconds += time.perf_counter() - start
+                    self._request_tokens += batch_tokens
+                    return embeddings
+                except RETRYABLE_ERRORS as e:
+                    if attempt >= self.max_retries or _is_quota_exhausted(e):
+                        raise
+                    delay = self._backoff(attempt, e)
+                    error = type(e).__name__
+
+            # Wait without holding a slot, so other batches can use it
+            logger.warning(
+                f"Embedding batch of {len(batch)} texts failed ({error}), retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _backoff(self, attempt: int, error: openai.APIError) -> float:
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+
+        delay = min(self.backoff_base * 2**attempt, self.backoff_max)
+        # Jitter, so batches that were limited together do not retry together
+        return random.uniform(delay / 2, delay)
+
+
+def _is_quota_exhausted(error: openai.APIError) -> bool:
+    # Sent with a 429, but retrying cannot help until the account is topped up
+    return isinstance(error, openai.RateLimitError) and error.code == "insufficient_quota"
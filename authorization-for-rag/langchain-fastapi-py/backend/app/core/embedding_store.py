@@ -0,0 +1,43 @@
+from pgvector.psycopg.vector import register_vector_info
+from psycopg.types import TypeInfo
+from psycopg.types.json import Json
+from sqlmodel import Session
+
+from app.models.embeddings import Embedding
+
+COPY_EMBEDDINGS = (
+    "COPY embedding (id, document_id, content, meta, embedding) "
+    "FROM STDIN (FORMAT BINARY)"
+)
+
+
+def copy_embeddings(db_session: Session, embeddings: list[Embedding]):
+    """
+    Insert embedding rows with a binary COPY, in the session's transaction.
+
+    Much faster than adding the rows through the ORM for large documents: rows
+    are streamed to Postgres in a single statement, and vectors are sent in
+    pgvector's binary format instead of as text.
+    """
+    if not embeddings:
+        return
+
+    # The psycopg connection of the session's current transaction
+    connection = db_session.connection().connection.driver_connection
+
+    with connection.cursor() as cursor:
+        # Registered on the cursor only, the ORM keeps its own vector handling
+        register_vector_info(cursor, TypeInfo.fetch(connection, "vector"))
+
+        with cursor.copy(COPY_EMBEDDINGS) as copy:
+            copy.set_types(["varchar", "uuid", "varchar", "json", "vector"])
+            for embedding in embeddings:
+                copy.write_row(
+                    (
+                        str(embedding.id),
+                        embedding.document_id,
+                        embedding.content,
+                        Json(embedding.meta),
+                        embedding.embedding,
+                    )
+                )
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from io import BytesIO
+
+import PyPDF2
+from sqlmodel import Session, col, delete, func, select, update
+
+from app.core.chunking import PAGE_BREAK
+from app.core.config import settings
+from app.core.db import engine
+from app.core.embedding_store import copy_embeddings
+from app.core.rag import generate_embeddings, split_text
+from app.models.documents import Document
+from app.models.embeddings import Embedding
+from app.models.ingestion_jobs import IngestionJob, IngestionStatus
+
+logger = logging.getLogger(__name__)
+
+
+def extract_text(content: bytes, file_type: str) -> str:
+    """Extract the text of an uploaded document."""
+    if file_type == "application/pdf":
+        pdf_reader = PyPDF2.PdfReader(BytesIO(content))
+        return PAGE_BREAK.join(page.extract_text() for page in pdf_reader.pages)
+
+    return content.decode("utf-8")
+
+
+class IngestionWorkers:
+    """
+    Pool of workers that ingest uploaded documents in the background.
+
+    Uploads store the document's bytes together with a queued `IngestionJob`
+    and submit the job here. Each worker claims one job at a time, then
+    extracts the text, chunks it, embeds the chunks and stores the embeddings,
+    recording the job's stage and progress as it goes. Blocking steps run in
+    threads and chunks are embedded in concurrent batches by the shared
+    embedding engine, so the API keeps serving requests while documents are
+    ingested.
+
+    Jobs that were queued or running when the server stopped are picked up
+    again on start, which assumes a single API process per database.
+    """
+
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue[uuid.UUID] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        # Created here, so the queue belongs to the event loop the workers run on
+        self._queue = asyncio.Queue()
+        pending = await asyncio.to_thread(_requeue_unfinished_jobs)
+        for job_id in pending:
+            self.submit(job_id)
+
+        self._tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job_id: uuid.UUID):
+        self._queue.put_nowait(job_id)
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._ingest(job_id)
+            except Exception as e:
+                logger.exception(f"Ingestion job {job_id} failed")
+                try:
+                    await asyncio.to_thread(
+                        _update_job, job_id, status=IngestionStatus.FAILED, error=str(e)
+                    )
+                except Exception:
+                    # The database may be what failed, the worker must keep running either way
+                    logger.exception(f"Could not record the failure of ingestion job {job_id}")
+            finally:
+                self._queue.task_done()
+
+    async def _ingest(self, job_id: uuid.UUID):
+        document = await asyncio.to_thread(_claim_job, job_id)
+        if document is None:
+            # Already claimed, finished or deleted together with its document
+            return
+
+        await asyncio.to_thread(_update_job, job_id, stage="extracting")
+        text = await asyncio.to_thread(
+            extract_text, document.content, document.file_type
+        )
+
+        await asyncio.to_thread(_update_job, job_id, stage="chunking")
+        chunks = await asyncio.to_thread(split_text, text, document.file_type)
+
+        await asyncio.to_thread(
+            _update_job, job_id, stage="embedding", chunks_total=len(chunks)
+        )
+
+        async def on_progress(chunks_embedded: int):
+            # Updates from concurrent batches may be written out of order
+            await asyncio.to_thread(
+                _update_job,
+                job_id,
+                chunks_embedded=func.greatest(
+                    col(IngestionJob.chunks_embedded), chunks_embedded
+                ),
+            )
+
+        embeddings, report = await generate_embeddings(
+            document.id, document.file_name, chunks, on_progress=on_progress
+        )
+        logger.info(
+            f"Embedded {report.chunks} chunks of {document.file_name}: "
+            f"{report.chunks_cached} cached ({report.hit_ratio:.0%}), "
+            f"saved ${report.cost_saved:.4f} and {report.seconds_saved:.1f}s"
+        )
+
+        await asyncio.to_thread(
+            _update_job,
+            job_id,
+            stage="storing",
+            chunks_cached=report.chunks_cached,
+            tokens_saved=report.tokens_saved,
+            cost_saved=report.cost_saved,
+            seconds_saved=report.seconds_saved,
+        )
+        await asyncio.to_thread(_store_embeddings, document.id, embeddings)
+
+        await asyncio.to_thread(
+            _update_job, job_id, status=IngestionStatus.SUCCEEDED, stage=None
+        )
+
+
+def _requeue_unfinished_jobs() -> list[uuid.UUID]:
+    with Session(engine) as db_session:
+        db_session.exec(
+            update(IngestionJob)
+            .where(col(IngestionJob.status) == IngestionStatus.RUNNING)
+            .values(status=IngestionStatus.QUEUED, stage=None, updated_at=datetime.now())
+        )
+        db_session.commit()
+
+        return list(
+            db_session.exec(
+                select(IngestionJob.id)
+                .where(col(IngestionJob.status) == IngestionStatus.QUEUED)
+                .order_by(col(IngestionJob.created_at))
+            ).all()
+        )
+
+
+def _claim_job(job_id: uuid.UUID) -> Document | None:
+    """Mark a queued job as running and return its document, or None if it cannot be claimed."""
+    with Session(engine) as db_session:
+        claimed = db_session.exec(
+            update(IngestionJob)
+            .where(col(IngestionJob.id) == job_id)
+            .where(col(IngestionJob.status) == IngestionStatus.QUEUED)
+            .values(
+                status=IngestionStatus.RUNNING,
+                chunks_embedded=0,
+                error=None,
+                updated_at=datetime.now(),
+            )
+        )
+        db_session.commit()
+        if claimed.rowcount == 0:
+            return None
+
+        document = db_session.exec(
+            select(Document)
+            .join(IngestionJob, col(IngestionJob.document_id) == col(Document.id))
+            .where(col(IngestionJob.id) == job_id)
+        ).first()
+        if document is not None:
+            db_session.expunge(document)
+        return document
+
+
+def _update_job(job_id: uuid.UUID, **values):
+    with Session(engine) as db_session:
+        db_session.exec(
+            update(IngestionJob)
+            .where(col(IngestionJob.id) == job_id)
+            .values(**values, updated_at=datetime.now())
+        )
+        db_session.commit()
+
+
+def _store_embeddings(document_id: uuid.UUID, embeddings: list[Embedding]):
+    with Session(engine) as db_session:
+        # A job that is run again replaces the embeddings of its previous attempt
+        db_session.exec(
+            delete(Embedding).where(col(Embedding.document_id) == document_id)
+        )
+        copy_embeddings(db_session, embeddings)
+        db_session.commit()
+
+
+ingestion_workers = IngestionWorkers(concurrency=settings.INGESTION_WORKERS)
@@ -1,11 +1,20 @@
+import asyncio
 import uuid
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from langchain_openai import OpenAIEmbeddings
 from langchain_postgres import PGVectorStore, PGEngine
 from pydantic import SecretStr
 
+from app.core.chunking import chunk_text, default_profiles
 from app.core.config import settings
 from app.core.db import engine
+from app.core.embedding_cache import (
+    cache_embeddings,
+    content_hash,
+    get_cached_embeddings,
+)
+from app.core.embedding_engine import EmbeddingEngine
 from app.models.embeddings import Embedding
 
 embedding_model = OpenAIEmbeddings(
@@ -13,23 +22,117 @@ embedding_model = OpenAIEmbeddings(
     api_key=SecretStr(settings.OPENAI_API_KEY),
 )
 
+embedding_engine = EmbeddingEngine(
+    # Without client retries, the engine owns backoff for document chunks
+    OpenAIEmbeddings(
+        model=embedding_model.model,
+        api_key=SecretStr(settings.OPENAI_API_KEY),
+        max_retries=0,
+    ),
+    batch_size=settings.EMBEDDING_BATCH_SIZE,
+    batch_tokens=settings.EMBEDDING_BATCH_TOKENS,
+    max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+    max_retries=settings.EMBEDDING_MAX_RETRIES,
+)
+
+chunking_profiles = default_profiles(
+    chunk_tokens=settings.CHUNK_TOKENS,
+    chunk_overlap=settings.CHUNK_OVERLAP_TOKENS,
+)
+
 vector_store: PGVectorStore | None = None
 
 
-def generate_embeddings(
-    document_id: uuid.UUID, file_name: str, text: str
-) -> list[Embedding]:
-    """Generate embeddings for a document."""
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=100,
-        chunk_overlap=10,
-        length_function=len,
+def split_text(text: str, file_type: str) -> list[str]:
+    """Split a document's text into the chunks that are embedded, with the profile of its file type."""
+    profile = chunking_profiles.get(file_type, chunking_profiles["text/plain"])
+    return chunk_text(text, profile, embedding_engine.token_length)
+
+
+@dataclass
+class EmbeddingReport:
+    """How many of a document's chunks did not have to be embedded, and what that saved."""
+
+    chunks: int
+    chunks_cached: int
+    tokens_saved: int
+    cost_saved: float
+    seconds_saved: float
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.chunks_cached / self.chunks if self.chunks else 0.0
+
+
+async def generate_embeddings(
+    document_id: uuid.UUID,
+    file_name: str,
+    chunks: list[str],
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+) -> tuple[list[Embedding], EmbeddingReport]:
+    """
+    Generate embeddings for a document's chunks.
+
+    Embeddings of chunks that were embedded before, by any document, are taken
+    from the embedding cache, and chunks repeated within the document are
+    embedded once. Only the rest is sent to the embedding model.
+    """
+    model = embedding_model.model
+    hashes, tokens = await asyncio.to_thread(
+        lambda: (
+            [content_hash(chunk) for chunk in chunks],
+            embedding_engine.count_tokens(chunks),
+        )
+    )
+
+    cached = (
+        await asyncio.to_thread(get_cached_embeddings, model, list(set(hashes)))
+        if settings.EMBEDDING_CACHE_ENABLED
+        else {}
     )
 
-    chunks = splitter.create_documents([text])
-    embeddings = embedding_model.embed_documents(
-        [chunk.page_content for chunk in chunks]
+    # Index of the first chunk of each text that has to be embedded
+    missing: dict[str, int] = {}
+    for index, chunk_hash in enumerate(hashes):
+        if chunk_hash not in cached and chunk_hash not in missing:
+            missing[chunk_hash] = index
+    chunks_cached = len(chunks) - len(missing)
+
+    async def embedding_progress(embedded: int):
+        if on_progress is not None:
+            await on_progress(chunks_cached + embedded)
+
+    if chunks_cached:
+        await embedding_progress(0)
+
+    new_embeddings = await embedding_engine.embed(
+        [chunks[index] for index in missing.values()],
+        on_progress=embedding_progress,
+        tokens=[tokens[index] for index in missing.values()],
     )
+    embedded = dict(zip(missing, new_embeddings))
+    if settings.EMBEDDING_CACHE_ENABLED:
+        await asyncio.to_thread(cache_embeddings, model, embedded)
+
+    tokens_saved = sum(tokens) - sum(tokens[index] for index in missing.values())
+    # Nothing has been timed yet when every chunk was cached since the server started
+    seconds_per_token = embedding_engine.seconds_per_token
+    if seconds_per_token is None:
+        seconds_per_token = settings.EMBEDDING_SECONDS_PER_TOKEN
+    report = EmbeddingReport(
+        chunks=len(chunks),
+        chunks_cached=chunks_cached,
+        tokens_saved=tokens_saved,
+        cost_saved=tokens_saved
+        * settings.EMBEDDING_PRICE_PER_MILLION_TOKENS
+        / 1_000_000,
+        seconds_saved=tokens_saved * seconds_per_token,
+    )
+
+    embeddings = [
+        cached[chunk_hash] if chunk_hash in cached else embedded[chunk_hash]
+        for chunk_hash in hashes
+    ]
 
     return [
         Embedding(
@@ -38,11 +141,11 @@ def generate_embeddings(
                 "file_name": file_name,
                 "document_id": str(document_id),
             },
-            content=chunk.page_content,
+            content=chunk,
             embedding=embedding,
         )
         for chunk, embedding in zip(chunks, embeddings)
-    ]
+    ], report
 
 
 async def get_vector_store():
@@ -8,6 +8,7 @@ from app.api.api_router import api_router
 from app.core.auth import auth_client
 from app.core.db import engine, init_db
 from app.core.fga import authorization_manager
+from app.core.ingestion import ingestion_workers
 
 
 @asynccontextmanager
@@ -15,10 +16,12 @@ async def lifespan(app: FastAPI):
     # Startup
     init_db()
     authorization_manager.connect()
+    await ingestion_workers.start()
 
     yield
 
     # Shutdown
+    await ingestion_workers.stop()
 
 
 app = FastAPI(
@@ -16,3 +16,7 @@ class DocumentWithoutContent(SQLModel):
 
 class Document(DocumentWithoutContent, table=True):
     content: bytes
+
+
+class UploadedDocument(DocumentWithoutContent):
+    job_id: uuid.UUID
@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime
 from typing import Dict
 from sqlmodel import JSON, Column, Field, SQLModel
 from pgvector.sqlalchemy import Vector
@@ -12,3 +13,12 @@ class Embedding(SQLModel, table=True):
     content: str
     meta: Dict = Field(default={}, sa_column=Column(JSON))
     embedding: list[float] = Field(sa_column=Column(Vector(1536)))
+
+
+class EmbeddingCache(SQLModel, table=True):
+    """Embeddings by model and hash of the normalized chunk text, shared by every document."""
+
+    model: str = Field(primary_key=True)
+    content_hash: str = Field(primary_key=True)
+    embedding: list[float] = Field(sa_column=Column(Vector(1536)))
+    created_at: datetime
@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from sqlmodel import Field, SQLModel
+
+
+class IngestionStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class IngestionJob(SQLModel, table=True):
+    """Background extraction, chunking, embedding and storage of an uploaded document."""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    document_id: uuid.UUID = Field(foreign_key="document.id", ondelete="CASCADE")
+    user_id: str = Field(index=True)
+    status: IngestionStatus = Field(default=IngestionStatus.QUEUED, index=True)
+    # Step of a running job: extracting, chunking, embedding or storing
+    stage: str | None = None
+    chunks_total: int = 0
+    chunks_embedded: int = 0
+    # Chunks served from the embedding cache, and the tokens, dollars and provider time that saved
+    chunks_cached: int = 0
+    tokens_saved: int = 0
+    cost_saved: float = 0.0
+    seconds_saved: float = 0.0
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
@@ -1,2 +1,3 @@
 import app.models.documents
 import app.models.embeddings
+import app.models.ingestion_jobs
\ No newline at end of file
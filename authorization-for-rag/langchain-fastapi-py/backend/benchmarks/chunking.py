@@ -0,0 +1,192 @@
+"""
+Compare chunking profiles on a sample corpus.
+
+Every document of the corpus is chunked with each configuration, the chunks are
+embedded, and the questions of the corpus are answered by retrieving the `--k`
+nearest chunks, the way the assistant's retriever does. The configurations are:
+
+- `characters-100`: the 100 character splitter that ingestion used before
+  chunks were sized in tokens, as a baseline
+- `tokens-N-flat`: chunks of N tokens, with the plain text profile for every file
+- `tokens-N`: chunks of N tokens, with the profile of each file type (headings
+  of markdown files and pages of PDFs are not crossed), as ingestion does
+
+For each configuration the benchmark reports the number of chunks, the tokens
+embedded and what they cost at `EMBEDDING_PRICE_PER_MILLION_TOKENS`, the
+estimated size of the embedding rows in Postgres, and retrieval quality: the
+share of questions with a chunk containing the answer among the top k
+(`recall`), the mean reciprocal rank of the first such chunk (`mrr`), and the
+mean number of tokens the top k chunks put in the model's context (`context`).
+
+Embeddings come from the OpenAI model used by ingestion (`--embeddings openai`,
+which needs `OPENAI_API_KEY` and costs a fraction of a cent for the sample
+corpus) or from an offline bag-of-words hashing stand-in (`--embeddings
+hashing`), whose quality numbers only compare lexical matching. The corpus is a
+directory of .txt, .md and .pdf files with a `questions.json` of questions and
+the exact text of their answers.
+
+Usage:
+    uv run python -m benchmarks.chunking
+    uv run python -m benchmarks.chunking --embeddings hashing --chunk-tokens 128 256 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import re
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.core.chunking import chunk_text, default_profiles
+from app.core.config import settings
+from app.core.ingestion import extract_text
+from app.core.rag import embedding_engine
+
+CORPUS = Path(__file__).parent / "corpus"
+FILE_TYPES = {".txt": "text/plain", ".md": "text/markdown", ".pdf": "application/pdf"}
+DIMENSIONS = 1536
+# Per row of the embedding table: the vector (4 bytes per dimension and a
+# header), the id, document id and metadata, and the tuple header
+ROW_BYTES = 4 * DIMENSIONS + 8 + 37 + 16 + 100 + 24
+
+_WORD = re.compile(r"[a-z0-9]+(?:[.,:-][a-z0-9]+)*")
+_STOPWORDS = set(
+    "a an and are as at be by can do does for from how i in is it its long much "
+    "of on or the to what when where which who will with".split()
+)
+
+Chunker = Callable[[str, str], list[str]]
+
+
+def load_corpus(path: Path) -> tuple[list[tuple[str, str, str]], list[dict]]:
+    """Return the (file name, file type, text) of the corpus's documents and its questions."""
+    documents = [
+        (file.name, FILE_TYPES[file.suffix], extract_text(file.read_bytes(), FILE_TYPES[file.suffix]))
+        for file in sorted(path.iterdir())
+        if file.suffix in FILE_TYPES
+    ]
+    questions = json.loads((path / "questions.json").read_text())
+    return documents, questions
+
+
+def chunkers(chunk_tokens: list[int]) -> dict[str, Chunker]:
+    length = embedding_engine.token_length
+    characters = RecursiveCharacterTextSplitter(chunk_size=100, chunk_overlap=10, length_function=len)
+    configurations: dict[str, Chunker] = {
+        "characters-100": lambda text, file_type: characters.split_text(text),
+    }
+
+    for tokens in chunk_tokens:
+        profiles = default_profiles(tokens, tokens // 8)
+        text_profile = profiles["text/plain"]
+        configurations[f"tokens-{tokens}-flat"] = (
+            lambda text, file_type, profile=text_profile: chunk_text(text, profile, length)
+        )
+        configurations[f"tokens-{tokens}"] = (
+            lambda text, file_type, profiles=profiles: chunk_text(text, profiles[file_type], length)
+        )
+
+    return configurations
+
+
+async def hashing_embed(texts: list[str]) -> list[list[float]]:
+    vectors = np.zeros((len(texts), DIMENSIONS))
+    for row, text in enumerate(texts):
+        for word in _WORD.findall(text.lower()):
+            if word not in _STOPWORDS:
+                vectors[row, zlib.crc32(word.encode()) % DIMENSIONS] += 1
+    # Sublinear term frequency, so a word repeated in a long chunk does not dominate
+    np.log1p(vectors, out=vectors)
+    return vectors.tolist()
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+async def evaluate(
+    chunks: list[str], questions: list[dict], embed, k: int
+) -> dict[str, float]:
+    chunk_vectors = np.array(await embed(chunks))
+    question_vectors = np.array(await embed([question["question"] for question in questions]))
+    chunk_vectors /= np.linalg.norm(chunk_vectors, axis=1, keepdims=True) + 1e-12
+    question_vectors /= np.linalg.norm(question_vectors, axis=1, keepdims=True) + 1e-12
+
+    normalized = [normalize(chunk) for chunk in chunks]
+    tokens = embedding_engine.count_tokens(chunks)
+    hits, reciprocal_ranks, context = 0, 0.0, 0
+    for question, scores in zip(questions, question_vectors @ chunk_vectors.T):
+        top = np.argsort(-scores)[:k]
+        answer = normalize(question["answer"])
+        ranks = [rank for rank, index in enumerate(top, start=1) if answer in normalized[index]]
+        if ranks:
+            hits += 1
+            reciprocal_ranks += 1 / ranks[0]
+        context += sum(tokens[index] for index in top)
+
+    return {
+        "recall": hits / len(questions),
+        "mrr": reciprocal_ranks / len(questions),
+        "context_tokens": context / len(questions),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    embed = embedding_engine.embed if args.embeddings == "openai" else hashing_embed
+
+    documents, questions = load_corpus(args.corpus)
+    print(f"corpus: {len(documents)} documents, {len(questions)} questions, {args.embeddings} embeddings, k={args.k}\n")
+    print(f"{'profile':<20} {'chunks':>7} {'tokens':>8} {'cost':>10} {'index':>9} "
+          f"{'recall':>7} {'mrr':>6} {'context':>8}")
+
+    results = []
+    for name, chunker in chunkers(args.chunk_tokens).items():
+        chunks = [chunk for _, file_type, text in documents for chunk in chunker(text, file_type)]
+        tokens = sum(embedding_engine.count_tokens(chunks))
+        result = {
+            "profile": name,
+            "chunks": len(chunks),
+            "tokens": tokens,
+            "cost": tokens * settings.EMBEDDING_PRICE_PER_MILLION_TOKENS / 1_000_000,
+            "index_bytes": len(chunks) * ROW_BYTES + sum(len(chunk.encode()) for chunk in chunks),
+            **await evaluate(chunks, questions, embed, args.k),
+        }
+        results.append(result)
+        print(
+            f"{name:<20} {result['chunks']:>7} {tokens:>8} ${result['cost']:>9.6f} "
+            f"{result['index_bytes'] / 1024:>7.0f}KB {result['recall']:>7.0%} "
+            f"{result['mrr']:>6.2f} {math.ceil(result['context_tokens']):>8}"
+        )
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=CORPUS, help="directory of documents and questions.json")
+    parser.add_argument("--chunk-tokens", type=int, nargs="+", default=[256, 512, 1024],
+                        help="chunk sizes in tokens to compare, with an overlap of 1/8 of the size")
+    parser.add_argument("--embeddings", choices=["openai", "hashing"], default="openai",
+                        help="embedding model used for retrieval quality")
+    parser.add_argument("--k", type=int, default=4, help="chunks retrieved per question")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON, for comparing runs")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
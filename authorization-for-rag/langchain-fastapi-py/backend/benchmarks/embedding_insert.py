@@ -0,0 +1,171 @@
+"""
+Compare ways of storing a document's embedding rows in Postgres.
+
+For each number of chunks, the same rows are stored for a throwaway document
+with each method, the way ingestion stores them: the document's previous
+embeddings are deleted and the new rows are inserted and committed in one
+transaction. Only that transaction is timed, building the rows is not.
+
+- `orm`: `Session.add_all()`, how embeddings used to be stored
+- `executemany`: a Core `INSERT` with a list of rows, batched by SQLAlchemy
+- `copy`: `copy_embeddings()`, a binary `COPY`, used by ingestion
+
+Rows carry 1536-dimension vectors and the same metadata as real chunks. The
+database is the one in `DATABASE_URL`, the benchmark document and its rows are
+deleted at the end.
+
+Usage:
+    uv run python -m benchmarks.embedding_insert
+    uv run python -m benchmarks.embedding_insert --sizes 1000 10000 --methods orm copy --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlmodel import Session, col, delete, insert
+
+from app.core.db import engine, init_db
+from app.core.embedding_store import copy_embeddings
+from app.models.documents import Document
+from app.models.embeddings import Embedding
+
+DIMENSIONS = 1536
+# Distinct vectors, rows share them so 100k rows fit in memory
+VECTORS = 64
+
+
+def store_orm(db_session: Session, rows: list[Embedding]):
+    db_session.add_all(rows)
+
+
+def store_executemany(db_session: Session, rows: list[Embedding]):
+    db_session.exec(
+        insert(Embedding),
+        params=[
+            {
+                "id": str(row.id),
+                "document_id": row.document_id,
+                "content": row.content,
+                "meta": row.meta,
+                "embedding": row.embedding,
+            }
+            for row in rows
+        ],
+    )
+
+
+STORES: dict[str, Callable[[Session, list[Embedding]], None]] = {
+    "orm": store_orm,
+    "executemany": store_executemany,
+    "copy": copy_embeddings,
+}
+
+
+def make_rows(document_id: uuid.UUID, count: int) -> list[Embedding]:
+    vectors = [
+        [random.uniform(-1, 1) for _ in range(DIMENSIONS)] for _ in range(VECTORS)
+    ]
+    return [
+        Embedding(
+            document_id=document_id,
+            meta={"file_name": "benchmark.txt", "document_id": str(document_id)},
+            content=f"Chunk {index} of the benchmark document, about as long as a real one.",
+            embedding=vectors[index % VECTORS],
+        )
+        for index in range(count)
+    ]
+
+
+def timed_store(document_id: uuid.UUID, rows: list[Embedding], store) -> float:
+    start = time.perf_counter()
+    with Session(engine) as db_session:
+        db_session.exec(
+            delete(Embedding).where(col(Embedding.document_id) == document_id)
+        )
+        store(db_session, rows)
+        db_session.commit()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+        help="numbers of chunks to store",
+    )
+    parser.add_argument(
+        "--methods", nargs="+", choices=list(STORES), default=list(STORES),
+        help="methods to compare",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="runs per size and method")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON, for comparing runs")
+    args = parser.parse_args()
+
+    init_db()
+    now = datetime.now()
+    document = Document(
+        file_name="benchmark.txt",
+        file_type="text/plain",
+        content=b"",
+        created_at=now,
+        updated_at=now,
+        user_id="benchmark",
+        user_email="benchmark@example.com",
+        shared_with=[],
+    )
+    with Session(engine) as db_session:
+        db_session.add(document)
+        db_session.commit()
+        document_id = document.id
+
+    results = []
+    try:
+        print(f"{'chunks':>8} {'method':<12} {'median':>10} {'rows/s':>10} {'speedup':>8}")
+        for size in args.sizes:
+            baseline = None
+            for method in args.methods:
+                seconds = []
+                for _ in range(args.runs):
+                    # Fresh rows every run, the ORM tracks the instances it stored
+                    rows = make_rows(document_id, size)
+                    seconds.append(timed_store(document_id, rows, STORES[method]))
+
+                median = statistics.median(seconds)
+                baseline = baseline or median
+                result = {
+                    "chunks": size,
+                    "method": method,
+                    "median_s": median,
+                    "rows_per_s": size / median,
+                    "speedup": baseline / median,
+                }
+                results.append(result)
+                print(
+                    f"{size:>8} {method:<12} {median * 1000:>8.0f}ms "
+                    f"{result['rows_per_s']:>10.0f} {result['speedup']:>7.1f}x"
+                )
+    finally:
+        with Session(engine) as db_session:
+            # Deletes the benchmark's embeddings too
+            db_session.exec(delete(Document).where(col(Document.id) == document_id))
+            db_session.commit()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())